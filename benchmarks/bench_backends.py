@@ -0,0 +1,64 @@
+"""
+Head-to-head benchmark of the SeleniumBot backends on the local test page.
+
+    python benchmarks/bench_backends.py --iterations 20
+
+Serves ``tests/static`` over HTTP on localhost and runs the same
+open/type/press sequence with the chromedriver ("selenium") and direct
+DevTools ("cdp") backends, reporting wall time per step.
+"""
+import argparse
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from webnavigator_ai.selenium_bot.browser import SeleniumBot
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "tests" / "static"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_static():
+    handler = functools.partial(QuietHandler, directory=str(STATIC_DIR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--profile", default="full")
+    args = parser.parse_args()
+
+    server = serve_static()
+    url = f"http://127.0.0.1:{server.server_port}/test_page.html"
+    steps = [
+        {"action": "open", "url": url, "sleep": 0},
+        {"action": "type", "selector": "#searchInput", "text": "webnavigator", "sleep": 0},
+        {"action": "press", "key": "ENTER", "sleep": 0},
+    ] * args.iterations
+
+    print(f"{'backend':<10} {'steps':>6} {'total s':>9} {'ms/step':>9} {'failures':>9}")
+    for backend in ("selenium", "cdp"):
+        bot = SeleniumBot(headless=True, profile=args.profile, backend=backend)
+        started = time.perf_counter()
+        trace = bot.run_steps(steps)
+        elapsed = time.perf_counter() - started
+        failures = sum(1 for e in trace if e.result != "success")
+        print(
+            f"{backend:<10} {len(trace):>6} {elapsed:>9.2f} "
+            f"{elapsed / len(trace) * 1000:>9.1f} {failures:>9}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
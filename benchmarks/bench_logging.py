@@ -0,0 +1,88 @@
+"""
+Caller-side logging overhead per job: synchronous StreamHandler vs the
+queued pipeline from ``webnavigator_ai.utils.logging``.
+
+    python benchmarks/bench_logging.py --jobs 2000 --write-latency-ms 0.2
+
+Each simulated job emits the records a ``run_job`` call typically logs
+(adapter call, URL selection, a failed step with traceback). Output goes to
+a stream whose writes take ``--write-latency-ms``, standing in for a slow
+or piped stdout. Only the time spent in the worker is measured.
+"""
+import argparse
+import io
+import logging
+import time
+
+from webnavigator_ai.utils.logging import (
+    configure_logging,
+    flush_logging,
+    job_context,
+    log_sampled,
+    TextFormatter,
+)
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, latency_s: float):
+        super().__init__()
+        self.latency_s = latency_s
+
+    def write(self, s):
+        time.sleep(self.latency_s)
+        return super().write(s)
+
+
+def simulate_job(logger: logging.Logger, job: int, sampled: bool):
+    log = (
+        (lambda level, key, msg, *a, **kw: log_sampled(logger, level, key, msg, *a, **kw))
+        if sampled
+        else (lambda level, key, msg, *a, **kw: logger.log(level, msg, *a, **kw))
+    )
+    with job_context(f"job-{job}"):
+        log(logging.INFO, "search", "Calling search adapter: %s for query: %.80s", "TavilyAdapter", f"query {job}")
+        logger.info("Agent selected URL by keyword match: %s", f"https://example.com/{job}")
+        try:
+            raise TimeoutError("page load timed out")
+        except TimeoutError as e:
+            log(logging.ERROR, "step-failed:open", "Selenium step %s failed: %s", "open", e, exc_info=True)
+        logger.info("Verification done for %s", f"https://example.com/{job}")
+
+
+def run(name: str, logger: logging.Logger, jobs: int, sampled: bool):
+    started = time.perf_counter()
+    for job in range(jobs):
+        simulate_job(logger, job, sampled)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<20} {jobs:>6} {elapsed:>9.3f} {elapsed / jobs * 1e6:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--write-latency-ms", type=float, default=0.2)
+    args = parser.parse_args()
+    latency = args.write_latency_ms / 1000
+
+    print(f"{'mode':<20} {'jobs':>6} {'total s':>9} {'us/job':>10}")
+
+    sync_logger = logging.getLogger("bench.sync")
+    sync_logger.propagate = False
+    sync_logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler(SlowStream(latency))
+    handler.setFormatter(TextFormatter())
+    sync_logger.addHandler(handler)
+    run("sync", sync_logger, args.jobs, sampled=False)
+
+    for fmt in ("text", "json"):
+        queued_logger = logging.getLogger(f"bench.queued.{fmt}")
+        queued_logger.propagate = False
+        queued_logger.setLevel(logging.INFO)
+        queued_logger.addHandler(configure_logging(fmt=fmt, stream=SlowStream(latency), max_queue=100_000))
+        run(f"queued-{fmt}", queued_logger, args.jobs, sampled=False)
+        run(f"queued-{fmt}+sample", queued_logger, args.jobs, sampled=True)
+        flush_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Compare SeleniumBot performance profiles on real pages.
+
+    python benchmarks/bench_profiles.py https://en.wikipedia.org/wiki/Selenium https://www.python.org
+
+Each profile gets a fresh browser; every URL is opened ``--repeat`` times and
+the per-profile load time and bytes transferred are printed.
+"""
+import argparse
+
+from webnavigator_ai.selenium_bot.browser import SeleniumBot
+from webnavigator_ai.selenium_bot.profiles import PROFILES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES))
+    args = parser.parse_args()
+
+    steps = [{"action": "open", "url": u, "sleep": 0} for u in args.urls] * args.repeat
+
+    print(f"{'profile':<10} {'pages':>5} {'avg ms':>9} {'max ms':>9} {'KiB':>10}")
+    for name in args.profiles:
+        bot = SeleniumBot(headless=True, profile=name)
+        summary = bot.metrics_summary(bot.run_steps(steps))
+        print(
+            f"{summary['profile']:<10} {summary['pages']:>5} "
+            f"{summary['load_ms_avg'] or 0:>9.1f} {summary['load_ms_max'] or 0:>9.1f} "
+            f"{summary['bytes_total'] / 1024:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import threading
+import time
+
+from webnavigator_ai.agent import supervisor as supervisor_module
+from webnavigator_ai.agent.batch import BatchRunner
+from webnavigator_ai.agent.memory import AgentMemory
+from webnavigator_ai.agent.supervisor import SupervisorAgent
+from webnavigator_ai.utils.limiter import AdaptiveLimiter
+from webnavigator_ai.utils.schema import NormalizedSearchResult
+
+
+def test_aimd_grows_additively_and_backs_off_once_per_burst():
+    limiter = AdaptiveLimiter("search", initial=2, max_limit=10, latency_target=1.0)
+
+    for _ in range(8):
+        limiter.acquire()
+        limiter.release(0.1)
+    assert limiter.limit == 4
+
+    # a burst of failures among calls already in flight halves the limit once
+    for _ in range(4):
+        limiter.acquire(timeout=0)
+    for _ in range(4):
+        limiter.release(2.0, ok=False)
+    assert limiter.limit == 2
+    assert limiter.metrics()["decreases"] == 1
+    assert limiter.metrics()["errors"] == 4
+
+
+def test_slot_reports_the_latency_the_caller_measured():
+    clock = iter([0.0, 30.0, 0.0, 30.0]).__next__
+    limiter = AdaptiveLimiter("browser", initial=2, latency_target=1.0, clock=clock)
+
+    with limiter.slot() as outcome:
+        outcome.latency = 0.2  # one page load, not the whole job
+    assert limiter.metrics()["ewma_latency_ms"] == 200.0
+    assert limiter.metrics()["decreases"] == 0
+
+    # nothing to measure: the slot is freed without a sample
+    with limiter.slot() as outcome:
+        outcome.latency = None
+    assert limiter.metrics()["completed"] == 1
+    assert limiter.metrics()["in_flight"] == 0
+
+
+def test_limit_converges_near_downstream_capacity():
+    capacity = 6
+    limiter = AdaptiveLimiter("browser", initial=1, max_limit=64)
+    history = []
+
+    for _ in range(300):
+        n = limiter.limit
+        for _ in range(n):
+            assert limiter.acquire(timeout=0)
+        # latency doubles past capacity, calls start failing at 1.5x
+        latency = 0.1 * max(1.0, n / capacity)
+        for _ in range(n):
+            limiter.release(latency, ok=n <= capacity * 1.5)
+        history.append(n)
+
+    settled = history[-100:]
+    assert max(settled) <= capacity * 2
+    assert sum(settled) / len(settled) >= capacity / 2
+
+
+def test_batch_runner_bounds_each_stage(monkeypatch, tmp_path):
+    class FakeBot:
+        def __init__(self, **kwargs):
+            self.page_texts = {}
+
+        def run_steps(self, steps, deadline=None):
+            return []
+
+        @staticmethod
+        def metrics_summary(trace):
+            return {}
+
+    class CountingAdapter:
+        api_key = "fake"
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def search(self, query, timeout=10):
+            with self.lock:
+                self.in_flight += 1
+                CountingAdapter.peak = max(CountingAdapter.peak, self.in_flight)
+            time.sleep(0.01)
+            with self.lock:
+                self.in_flight -= 1
+            return [NormalizedSearchResult(title=query, snippet="", url="https://example.com", source="test")]
+
+    monkeypatch.setattr(supervisor_module, "SeleniumBot", FakeBot)
+    agent = SupervisorAgent(gemini_key=None)
+    agent.memory = AgentMemory(path=str(tmp_path / "memory.json"))
+    adapter = CountingAdapter()
+    monkeypatch.setattr(agent, "_choose_adapter", lambda: adapter)
+
+    runner = BatchRunner(
+        agent,
+        limiters={
+            "search": AdaptiveLimiter("search", initial=2, max_limit=3),
+            "browser": AdaptiveLimiter("browser", initial=2, max_limit=2),
+        },
+        max_workers=8,
+    )
+    results = runner.run([{"query": f"q{i}", "steps": []} for i in range(24)])
+
+    assert [r["query"] for r in results] == [f"q{i}" for i in range(24)]
+    assert CountingAdapter.peak <= 3
+    metrics = runner.metrics()
+    assert metrics["search"]["completed"] == 24
+    assert metrics["search"]["in_flight"] == 0
+    assert set(metrics) == {"search", "browser"}
+
+
+def test_batch_runner_builds_shared_clients_and_counts_calls_safely(monkeypatch, tmp_path):
+    agent = SupervisorAgent(gemini_key=None, tavily_key="fake")
+    agent.memory = AgentMemory(path=str(tmp_path / "memory.json"))
+    BatchRunner(agent)
+
+    # built once up front, not raced for by the first jobs
+    assert {"tavily", "serpapi", "serper", "verifier"} <= set(vars(agent))
+    assert agent.limiters["search"].name == "search"
+
+    monkeypatch.setattr(type(agent.tavily), "search", lambda self, query, timeout=10: [])
+    threads = [
+        threading.Thread(target=lambda: [agent._call_search(agent.tavily, "q") for _ in range(200)])
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert agent.search_calls == 1600
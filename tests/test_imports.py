@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from pathlib import Path
+
+HEAVY_MODULES = ("selenium", "webdriver_manager", "tenacity", "requests", "websocket")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _imported_modules(code: str) -> set:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            modules.add(name.split(".")[0])
+    return modules
+
+
+def test_cold_start_does_not_import_heavy_dependencies():
+    modules = _imported_modules(
+        "from webnavigator_ai.agent import AgentMemory, SupervisorAgent\n"
+        "from webnavigator_ai.utils.schema import NormalizedSearchResult\n"
+        "from webnavigator_ai.verifier.gemini_verifier import GeminiVerifier\n"
+        "from webnavigator_ai.verifier.cache import VerdictCache\n"
+        "v = GeminiVerifier(api_key=None, cache=VerdictCache(path=None))\n"
+        "v.verify_claims([NormalizedSearchResult('t', 's', 'https://a.gov', 'x')])\n"
+    )
+
+    assert "webnavigator_ai" in modules
+    assert not modules.intersection(HEAVY_MODULES)
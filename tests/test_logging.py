@@ -0,0 +1,66 @@
+import io
+import json
+import logging
+
+from webnavigator_ai.utils.logging import (
+    LogSampler,
+    configure_logging,
+    flush_logging,
+    job_context,
+    setup_logger,
+)
+
+
+def test_queued_json_logging_carries_job_id():
+    stream = io.StringIO()
+    configure_logging(fmt="json", stream=stream)
+    try:
+        logger = setup_logger("webnavigator.test_logging")
+        with job_context("job-123"):
+            logger.info("opened %s", "https://example.com")
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("step failed")
+        logger.info("outside")
+        flush_logging()
+    finally:
+        configure_logging()
+
+    first, second, third = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert first["msg"] == "opened https://example.com"
+    assert first["job_id"] == "job-123"
+    assert "ValueError: boom" in second["exc"]
+    assert "job_id" not in third
+
+
+def test_text_logging_prefixes_job_id():
+    stream = io.StringIO()
+    configure_logging(fmt="text", stream=stream)
+    try:
+        logger = setup_logger("webnavigator.test_logging_text")
+        with job_context("job-7"):
+            logger.error("step failed")
+        logger.info("outside")
+        flush_logging()
+    finally:
+        configure_logging()
+
+    first, second = stream.getvalue().splitlines()
+    assert first.endswith(" - ERROR - [job-7] step failed")
+    assert second.endswith(" - INFO - [-] outside")
+
+
+def test_log_sampler_suppresses_repeats_and_reports_count(caplog):
+    clock = iter([0.0, 1.0, 2.0, 11.0])
+    sampler = LogSampler(interval=10.0, clock=lambda: next(clock))
+    logger = logging.getLogger("webnavigator.test_sampler")
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        for _ in range(4):
+            sampler.log(logger, logging.INFO, "search", "Calling adapter")
+
+    assert [r.getMessage() for r in caplog.records] == [
+        "Calling adapter",
+        "Calling adapter (2 similar suppressed)",
+    ]
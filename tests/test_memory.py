@@ -11,3 +11,49 @@ def test_agent_memory_store_and_retrieve(tmp_path):
     assert memory.recall_query("python selenium") == "https://example.com"
     assert memory.recall_query("github") == "https://github.com"
     assert memory.recall_query("unknown") is None
+
+
+def test_agent_memory_tracks_domain_load_stats(tmp_path):
+    memory = AgentMemory(path=str(tmp_path / "memory.json"))
+
+    memory.observe_trace([
+        {"action": "open", "selector": "https://www.slow.example.com/a", "result": "success", "load_ms": 9000.0, "bytes": 4000},
+        {"action": "open", "selector": "https://slow.example.com/b", "result": "failure"},
+        {"action": "open", "selector": "https://slow.example.com/c", "result": "success", "load_ms": 7000.0},
+        {"action": "open", "selector": "https://slow.example.com/d", "result": "skipped"},
+        {"action": "type", "selector": "input[name='q']", "result": "success"},
+    ])
+
+    stats = AgentMemory(path=str(tmp_path / "memory.json")).domain_latency("slow.example.com")
+    assert stats["attempts"] == 3
+    assert stats["failure_rate"] == 0.333
+    assert stats["p90_ms"] == 9000.0
+    assert stats["avg_bytes"] == 4000
+    assert memory.latency_penalty("https://slow.example.com/x") > 0.6
+    assert memory.latency_penalty("https://unknown.example.com/") == 0.0
+
+
+def test_hot_queries_rank_by_decayed_frequency(tmp_path):
+    memory = AgentMemory(path=str(tmp_path / "memory.json"))
+    for query, count in (("selenium docs", 5), ("python", 3), ("rare", 1)):
+        for _ in range(count):
+            memory.remember_query(query, "https://example.com")
+
+    assert memory.hot_queries() == ["selenium docs", "python", "rare"]
+    assert memory.hot_queries(min_count=2) == ["selenium docs", "python"]
+
+    # a popular query nobody asked for in a week drops below a fresh one
+    memory._data["query_stats"]["selenium docs"]["last_seen"] -= 7 * 24 * 3600
+    assert memory.hot_queries(limit=1, half_life_hours=24) == ["python"]
+
+
+def test_queries_remembered_before_stats_are_backfilled(tmp_path):
+    import json
+
+    path = tmp_path / "memory.json"
+    path.write_text(json.dumps({"queries": {"old query": "https://example.com"}, "domains": {}}))
+
+    memory = AgentMemory(path=str(path))
+
+    assert memory.hot_queries() == ["old query"]
+    assert memory._data["query_stats"]["old query"] == {"count": 1, "last_seen": path.stat().st_mtime}
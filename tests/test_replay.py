@@ -0,0 +1,111 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from webnavigator_ai.adapters.serper import SerperAdapter
+from webnavigator_ai.replay.cassette import Cassette, decode_body
+from webnavigator_ai.replay.server import ReplayServer
+
+
+class FakeSerper(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(
+            {"organic": [{"title": "Selenium", "snippet": "Docs", "link": "https://selenium.dev"}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_adapter_traffic_records_and_replays_offline(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSerper)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}/search"
+    path = tmp_path / "run.jsonl.gz"
+
+    with Cassette(str(path), mode="record") as cassette:
+        adapter = SerperAdapter(api_key="secret-key", session=cassette.session())
+        adapter.base = endpoint
+        recorded = adapter.search("python selenium")
+    server.shutdown()
+    server.server_close()
+
+    assert b"secret-key" not in path.read_bytes()
+
+    replay = Cassette(str(path), mode="replay")
+    adapter = SerperAdapter(api_key="other-key", session=replay.session())
+    adapter.base = endpoint
+    replayed = adapter.search("python selenium")
+
+    assert [r.to_dict() for r in replayed] == [r.to_dict() for r in recorded]
+
+
+def test_replay_server_serves_recorded_pages_locally(tmp_path):
+    path = tmp_path / "pages.jsonl.gz"
+    with Cassette(str(path), mode="record") as cassette:
+        cassette.record_resource(
+            "https://example.com/docs",
+            b'<link href="https://cdn.example.com/site.css"><h1>Docs</h1>',
+            "text/html",
+            kind="page",
+        )
+        cassette.record_resource("https://cdn.example.com/site.css", b"h1{}", "text/css")
+        cassette.record_resource("https://other.com/docs", b'<img src="/logo.png">', "text/html", kind="page")
+        cassette.record_resource("https://other.com/logo.png", b"png", "image/png")
+
+    server = ReplayServer(Cassette(str(path), mode="replay")).start()
+    try:
+        page = requests.get(server.url_for("https://example.com/docs"), timeout=5)
+        other = requests.get(server.url_for("https://other.com/docs"), timeout=5)
+        css = requests.get(server.base_url + "/__host__/cdn.example.com/site.css", timeout=5)
+        logo = requests.get(
+            server.base_url + "/logo.png",
+            headers={"Referer": server.url_for("https://other.com/docs")},
+            timeout=5,
+        )
+    finally:
+        server.stop()
+
+    assert page.text == '<link href="/__host__/cdn.example.com/site.css"><h1>Docs</h1>'
+    assert other.text == '<img src="/__host__/other.com/logo.png">'
+    assert css.text == "h1{}"
+    assert logo.content == b"png"
+
+
+def test_cassette_runs_use_an_in_memory_verdict_cache(tmp_path):
+    from webnavigator_ai.agent.supervisor import SupervisorAgent
+
+    agent = SupervisorAgent(cassette=Cassette(str(tmp_path / "run.jsonl.gz"), mode="record"))
+
+    assert agent.verifier.cache.path is None
+
+
+def test_recording_captures_pages_reached_by_press(tmp_path):
+    from unittest.mock import MagicMock, patch
+
+    from webnavigator_ai.selenium_bot.browser import SeleniumBot
+
+    mock_driver = MagicMock()
+    mock_driver.current_url = "https://example.com/results?q=selenium"
+    mock_driver.page_source = "<h1>Results</h1>"
+    mock_driver.execute_script.return_value = []
+
+    cassette = Cassette(str(tmp_path / "pages.jsonl.gz"), mode="record")
+    with patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path"), \
+            patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome", return_value=mock_driver):
+        SeleniumBot(headless=True, cassette=cassette).run_steps([
+            {"action": "type", "selector": "input[name='q']", "text": "selenium", "sleep": 0},
+            {"action": "press", "key": "ENTER", "sleep": 0},
+        ])
+
+    entry = cassette.resource("https://example.com/results?q=selenium")
+    assert entry["kind"] == "page"
+    assert decode_body(entry) == b"<h1>Results</h1>"
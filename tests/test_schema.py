@@ -0,0 +1,34 @@
+import json
+from io import BytesIO
+
+from webnavigator_ai.utils.schema import NormalizedSearchResult, TraceEvent
+from webnavigator_ai.utils.serialize import to_json_bytes, write_jsonl
+
+
+def test_result_to_dict_does_not_copy_raw():
+    raw = {"position": 1, "sitelinks": [{"title": "Docs"}]}
+    result = NormalizedSearchResult(
+        title="Selenium", snippet="", url="https://selenium.dev", source="test", raw=raw
+    )
+
+    assert result.to_dict()["raw"] is raw
+    assert result.to_dict(include_raw=False)["raw"] is None
+    assert not hasattr(result, "__dict__")
+
+
+def test_serializer_writes_compact_json_and_jsonl():
+    result = NormalizedSearchResult(
+        title="Ünïcode", snippet="", url="https://example.com", source="test", raw={"k": 1}
+    )
+    event = TraceEvent(action="open", selector="https://example.com", timestamp="t", result="success")
+
+    payload = to_json_bytes({"results": [result], "trace": [event]}, include_raw=False)
+    decoded = json.loads(payload)
+    assert decoded["results"][0]["raw"] is None
+    assert decoded["trace"][0] == event.to_dict()
+    assert b" " not in payload.replace("Ünïcode".encode(), b"")
+
+    buf = BytesIO()
+    assert write_jsonl([event, event], buf) == 2
+    assert buf.getvalue().count(b"\n") == 2
+    assert event["result"] == "success"
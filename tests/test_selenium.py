@@ -1,5 +1,31 @@
+import json
+import shutil
+import subprocess
 from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from webnavigator_ai.agent.memory import AgentMemory
 from webnavigator_ai.selenium_bot.browser import SeleniumBot
+from webnavigator_ai.utils.deadline import Deadline
+
+
+def _perf_entry(method, webview="target-primary", **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}, "webview": webview})}
+
+
+def _loading_finished(encoded_bytes, webview="target-primary"):
+    return _perf_entry("Network.loadingFinished", webview, encodedDataLength=encoded_bytes)
+
+
+def _cdp_per_tab(driver):
+    """execute_cdp_cmd stand-in: one DevTools target per window handle."""
+    def execute_cdp_cmd(method, params):
+        if method == "Target.getTargetInfo":
+            return {"targetInfo": {"targetId": f"target-{driver.current_window_handle}"}}
+        return {}
+    return execute_cdp_cmd
 
 
 @patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
@@ -16,3 +42,579 @@ def test_selenium_open_step(mock_chrome, mock_resolve):
     assert isinstance(trace, list)
     assert trace[0]["action"] == "open"
     assert trace[0]["result"] == "success"
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_selenium_fast_profile_blocks_resources(mock_chrome, mock_resolve):
+    mock_driver = MagicMock()
+    mock_driver.current_window_handle = "primary"
+    mock_driver.execute_cdp_cmd.side_effect = _cdp_per_tab(mock_driver)
+    mock_driver.get_log.side_effect = [
+        [_loading_finished(999)],  # an earlier step's page, dropped
+        [
+            _loading_finished(1500),
+            _loading_finished(0),
+            _perf_entry("Network.requestWillBeSent"),
+            _loading_finished(4096, webview="target-other-tab"),  # another tab's traffic
+        ],
+        [_loading_finished(548)],  # arrived after DOMContentLoaded
+    ]
+    mock_chrome.return_value = mock_driver
+
+    bot = SeleniumBot(headless=True, profile="fast")
+    trace = bot.run_steps([{"action": "open", "url": "https://example.com", "sleep": 0}])
+
+    options = mock_chrome.call_args.kwargs["options"]
+    assert options.page_load_strategy == "eager"
+    assert "--disable-extensions" in options.arguments
+    assert not any(a.startswith("--disk-cache-dir") for a in options.arguments)
+    assert options.capabilities["goog:loggingPrefs"] == {"performance": "ALL"}
+    blocked = [c.args for c in mock_driver.execute_cdp_cmd.call_args_list if c.args[0] == "Network.setBlockedURLs"]
+    assert "*.woff2" in blocked[-1][1]["urls"]
+
+    summary = bot.metrics_summary(trace)
+    assert summary["profile"] == "fast"
+    assert summary["pages"] == 1
+    assert summary["bytes_total"] == 2048
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_step_clipped_by_job_deadline_is_skipped(mock_chrome, mock_resolve):
+    mock_driver = MagicMock()
+    mock_chrome.return_value = mock_driver
+    deadline = Deadline(10)
+
+    def load_past_deadline(url):
+        deadline._expires_at = 0.0  # the page load ate the rest of the budget
+        raise TimeoutException("timeout: Timed out receiving message from renderer")
+
+    mock_driver.get.side_effect = load_past_deadline
+
+    bot = SeleniumBot(headless=True)
+    trace = bot.run_steps([{"action": "open", "url": "https://example.com", "sleep": 0}], deadline=deadline)
+
+    assert trace[0]["result"] == "skipped"
+    assert trace[0]["error"].startswith("deadline exceeded")
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_extract_after_failed_open_is_skipped(mock_chrome, mock_resolve):
+    mock_driver = MagicMock()
+    mock_driver.get.side_effect = RuntimeError("net::ERR_NAME_NOT_RESOLVED")
+    mock_chrome.return_value = mock_driver
+
+    bot = SeleniumBot(headless=True)
+    trace = bot.run_steps([
+        {"action": "open", "url": "https://gone.example", "sleep": 0},
+        {"action": "extract", "sleep": 0},
+    ])
+
+    assert [(e.action, e.result) for e in trace] == [("open", "failure"), ("extract", "skipped")]
+    assert trace[1].error == "no page open"
+    assert bot.page_texts == {}
+
+
+@patch("webnavigator_ai.selenium_bot.cdp.CDPDriver._page_ws_url", return_value="ws://dummy")
+@patch("webnavigator_ai.selenium_bot.cdp.CDPConnection")
+def test_cdp_backend_runs_steps_without_chromedriver(mock_conn_cls, mock_ws_url):
+    sent = []
+
+    def send(method, params=None):
+        sent.append(method)
+        if method == "Runtime.evaluate":
+            return {"result": {"value": True}}
+        return {}
+
+    mock_conn_cls.return_value.send.side_effect = send
+
+    bot = SeleniumBot(backend="cdp", debugger_address="127.0.0.1:9222")
+    trace = bot.run_steps([
+        {"action": "open", "url": "http://127.0.0.1/test_page.html", "sleep": 0},
+        {"action": "type", "selector": "#searchInput", "text": "selenium", "sleep": 0},
+        {"action": "press", "key": "ENTER", "sleep": 0},
+    ])
+
+    assert [e.result for e in trace] == ["success", "success", "success"]
+    assert "Page.navigate" in sent
+    assert "Input.insertText" in sent
+    assert sent.count("Input.dispatchKeyEvent") == 2
+    # the open waits for its load, and so does the navigation ENTER started
+    assert [c.args[0] for c in mock_conn_cls.return_value.wait_event.call_args_list] == [
+        "Page.loadEventFired", "Page.frameStartedLoading", "Page.loadEventFired",
+    ]
+    mock_conn_cls.return_value.close.assert_called_once()
+
+
+@patch("webnavigator_ai.selenium_bot.cdp.time.sleep")
+@patch("webnavigator_ai.selenium_bot.cdp.CDPDriver._page_ws_url", return_value="ws://dummy")
+@patch("webnavigator_ai.selenium_bot.cdp.CDPConnection")
+def test_cdp_backend_waits_for_late_elements(mock_conn_cls, mock_ws_url, mock_sleep):
+    from webnavigator_ai.selenium_bot.cdp import CDPError
+
+    focus = iter([False, False, True])  # the input renders on the third look
+    # the results page is still replacing the old one, then has no match yet
+    click = iter([CDPError("Execution context was destroyed."), None, "https://www.selenium.dev/"])
+    looks = []
+
+    def send(method, params=None):
+        if method != "Runtime.evaluate":
+            return {}
+        if "el.focus()" in params["expression"]:
+            looks.append("type")
+            return {"result": {"value": next(focus)}}
+        if "uddg" in params["expression"]:
+            looks.append("click")
+            value = next(click)
+            if isinstance(value, Exception):
+                raise value
+            return {"result": {"value": value}}
+        return {"result": {"value": 0}}
+
+    mock_conn_cls.return_value.send.side_effect = send
+    mock_conn_cls.return_value.wait_event.side_effect = TimeoutError  # ENTER navigates nowhere
+
+    bot = SeleniumBot(backend="cdp", debugger_address="127.0.0.1:9222", implicit_wait=5)
+    trace = bot.run_steps([
+        {"action": "type", "selector": "#q", "text": "selenium", "sleep": 0},
+        {"action": "press", "key": "ENTER", "sleep": 0},
+        {"action": "click_dynamic", "url": "https://selenium.dev", "sleep": 0},
+    ])
+
+    assert [e.result for e in trace] == ["success", "success", "success"]
+    assert trace[2].selector == "https://www.selenium.dev/"
+    assert looks == ["type"] * 3 + ["click"] * 3
+
+
+@patch("webnavigator_ai.selenium_bot.cdp.websocket")
+def test_cdp_counts_bytes_from_loading_finished_events(mock_websocket):
+    from webnavigator_ai.selenium_bot.cdp import CDPConnection, CDPDriver
+
+    mock_websocket.create_connection.return_value.recv.side_effect = [
+        json.dumps({"method": "Network.loadingFinished", "params": {"encodedDataLength": 700}}),
+        json.dumps({"method": "Page.loadEventFired", "params": {}}),
+        json.dumps({"method": "Network.loadingFinished", "params": {"encodedDataLength": 300}}),
+        json.dumps({"id": 1, "result": {}}),
+        json.dumps({"id": 2, "result": {}}),
+    ]
+    driver = CDPDriver(debugger_address="127.0.0.1:9222")
+    driver.conn = CDPConnection("ws://dummy")
+
+    assert driver.transferred_bytes() == 1000
+    assert driver.transferred_bytes() == 0
+    assert driver.conn.wait_event("Page.loadEventFired", 1)["method"] == "Page.loadEventFired"
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_failed_primary_promotes_prefetched_tab(mock_chrome, mock_resolve, tmp_path):
+    mock_driver = MagicMock()
+    mock_driver.current_window_handle = "primary"
+    mock_driver.current_url = "https://backup.example.com/"
+    mock_driver.get.side_effect = RuntimeError("net::ERR_CONNECTION_RESET")
+    mock_driver.execute_script.side_effect = lambda script, *args: (
+        "complete" if "readyState" in script else 850.0 if "loadEventEnd" in script else None
+    )
+    mock_chrome.return_value = mock_driver
+
+    bot = SeleniumBot(headless=True, max_prefetch_tabs=1)
+    trace = bot.run_steps([
+        {
+            "action": "open",
+            "url": "https://primary.example.com",
+            "prefetch": ["https://backup.example.com", "https://third.example.com"],
+            "sleep": 0,
+        }
+    ])
+
+    # the primary's failure is kept; the promoted tab is timed on its own
+    assert [(e.selector, e.result) for e in trace] == [
+        ("https://primary.example.com", "failure"),
+        ("https://backup.example.com", "success"),
+    ]
+    assert trace[0].load_ms is None
+    assert trace[1].load_ms == 850.0
+    assert mock_driver.switch_to.new_window.call_count == 1
+
+    memory = AgentMemory(path=str(tmp_path / "memory.json"))
+    memory.observe_trace(trace)
+    assert memory.domain_latency("primary.example.com")["failure_rate"] == 1.0
+    assert memory.domain_latency("backup.example.com")["p50_ms"] == 850.0
+
+
+def test_prefetch_heap_bound_counts_the_prefetched_tabs():
+    mock_driver = MagicMock()
+    mock_driver.current_window_handle = "primary"
+    measured = []
+
+    def new_window(kind):
+        mock_driver.current_window_handle = f"tab-{mock_driver.switch_to.new_window.call_count - 1}"
+
+    def switch(handle):
+        mock_driver.current_window_handle = handle
+
+    def execute_cdp_cmd(method, params):
+        if method != "Performance.getMetrics":
+            return {}
+        measured.append(mock_driver.current_window_handle)
+        return {"metrics": [{"name": "JSHeapUsedSize", "value": 300e6}]}
+
+    mock_driver.switch_to.new_window.side_effect = new_window
+    mock_driver.switch_to.window.side_effect = switch
+    mock_driver.execute_cdp_cmd.side_effect = execute_cdp_cmd
+
+    bot = SeleniumBot(headless=True, max_prefetch_tabs=3, prefetch_max_heap_mb=512)
+    bot.driver = mock_driver
+    bot._start_prefetch(["https://a.example", "https://b.example", "https://c.example"])
+
+    # 300 MB after one tab is under the bound, 600 MB after two is not
+    assert [url for _, url in bot._prefetched] == ["https://a.example", "https://b.example"]
+    assert measured == ["tab-0", "tab-0", "tab-1"]
+    assert mock_driver.current_window_handle == "primary"
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_prefetched_tabs_get_blocklist_and_are_recorded(mock_chrome, mock_resolve, tmp_path):
+    from webnavigator_ai.replay.cassette import Cassette
+
+    mock_driver = MagicMock()
+    mock_driver.current_window_handle = "primary"
+    mock_driver.page_source = "<p>page</p>"
+    mock_driver.execute_script.return_value = []
+    mock_chrome.return_value = mock_driver
+
+    cassette = Cassette(str(tmp_path / "c.jsonl.gz"), mode="record")
+    bot = SeleniumBot(headless=True, profile="fast", max_prefetch_tabs=2, cassette=cassette)
+    bot.run_steps([
+        {
+            "action": "open",
+            "url": "https://primary.example.com",
+            "prefetch": ["https://backup.example.com", "https://third.example.com"],
+            "sleep": 0,
+        }
+    ])
+
+    blocklist_calls = [
+        c for c in mock_driver.execute_cdp_cmd.call_args_list if c.args[0] == "Network.setBlockedURLs"
+    ]
+    assert len(blocklist_calls) == 3  # first tab + two prefetch tabs
+    assert cassette.resource("https://backup.example.com")["kind"] == "page"
+    assert cassette.resource("https://third.example.com")["kind"] == "page"
+    cassette.save()
+
+    replay = Cassette(str(tmp_path / "c.jsonl.gz"), mode="replay")
+    replay._resources.pop("https://third.example.com")
+    bot = SeleniumBot(headless=True, cassette=replay)
+    bot.driver = mock_driver
+    mock_driver.switch_to.new_window.reset_mock()
+    bot._replay_server = MagicMock()
+    bot._start_prefetch(["https://backup.example.com", "https://third.example.com"])
+    assert mock_driver.switch_to.new_window.call_count == 1
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_tab_group_runs_tabs_round_robin(mock_chrome, mock_resolve, tmp_path):
+    from webnavigator_ai.replay.cassette import Cassette
+
+    mock_driver = MagicMock()
+    mock_driver.current_window_handle = "primary"
+    mock_driver.page_source = "<p>tab</p>"
+    loads_pending = {"tab-1": 2}  # second tab needs a few polls to finish loading
+
+    def new_window(kind):
+        mock_driver.current_window_handle = f"tab-{mock_driver.switch_to.new_window.call_count - 1}"
+
+    def switch(handle):
+        mock_driver.current_window_handle = handle
+
+    def execute_script(script, *args):
+        if "readyState" in script:
+            handle = mock_driver.current_window_handle
+            if loads_pending.get(handle):
+                loads_pending[handle] -= 1
+                return False
+            return True
+        return None
+
+    # the log covers every tab; the first lane to read it must not take tab 1's bytes
+    logs = [[_loading_finished(512, webview="target-tab-0"), _loading_finished(256, webview="target-tab-1")]]
+    mock_driver.get_log.side_effect = lambda kind: logs.pop() if logs else []
+    mock_driver.execute_cdp_cmd.side_effect = _cdp_per_tab(mock_driver)
+    mock_driver.switch_to.new_window.side_effect = new_window
+    mock_driver.switch_to.window.side_effect = switch
+    mock_driver.execute_script.side_effect = execute_script
+    mock_chrome.return_value = mock_driver
+
+    cassette = Cassette(str(tmp_path / "tabs.jsonl.gz"), mode="record")
+    bot = SeleniumBot(headless=True, profile="fast", cassette=cassette)
+    trace = bot.run_steps([
+        {
+            "action": "tab_group",
+            "sleep": 0,
+            "tabs": [
+                [{"action": "open", "url": "https://a.example.com"},
+                 {"action": "press", "key": "ENTER"}],
+                [{"action": "open", "url": "https://b.example.com"}],
+            ],
+        }
+    ])
+
+    assert [(e.tab, e.action, e.result) for e in trace] == [
+        (0, "open", "success"),
+        (0, "press", "success"),
+        (1, "open", "success"),
+    ]
+    assert (trace[0].bytes, trace[2].bytes) == (512, 256)
+    assert mock_driver.current_window_handle == "primary"
+    # every tab gets the profile blocklist, and tab pages are recorded
+    assert [c.args[0] for c in mock_driver.execute_cdp_cmd.call_args_list].count("Network.setBlockedURLs") == 3
+    assert cassette.resource("https://b.example.com")["kind"] == "page"
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_tab_group_extract_files_text_under_the_lane_page(mock_chrome, mock_resolve):
+    mock_driver = MagicMock()
+    mock_driver.current_window_handle = "primary"
+
+    def new_window(kind):
+        mock_driver.current_window_handle = f"tab-{mock_driver.switch_to.new_window.call_count - 1}"
+
+    def switch(handle):
+        mock_driver.current_window_handle = handle
+
+    def execute_script(script, *args):
+        if "readyState" in script:
+            return True
+        if "blocks" in script:
+            text = f"Text of the page loaded in {mock_driver.current_window_handle}, long enough to keep."
+            return {"blocks": [text], "done": True}
+        return None
+
+    mock_driver.switch_to.new_window.side_effect = new_window
+    mock_driver.switch_to.window.side_effect = switch
+    mock_driver.execute_script.side_effect = execute_script
+    mock_chrome.return_value = mock_driver
+
+    bot = SeleniumBot(headless=True)
+    trace = bot.run_steps([
+        {"action": "open", "url": "https://primary.example", "sleep": 0},
+        {
+            "action": "tab_group",
+            "sleep": 0,
+            "tabs": [
+                [{"action": "open", "url": "https://a.example"}, {"action": "extract"}],
+                [{"action": "open", "url": "https://b.example"}, {"action": "extract"}],
+            ],
+        },
+    ])
+
+    extracts = sorted((e.tab, e.selector) for e in trace if e.action == "extract")
+    assert extracts == [(0, "https://a.example"), (1, "https://b.example")]
+    assert "tab-0" in bot.page_texts["https://a.example"]
+    assert "tab-1" in bot.page_texts["https://b.example"]
+    assert "https://primary.example" not in bot.page_texts
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_tab_group_poll_error_fails_only_that_tab(mock_chrome, mock_resolve):
+    mock_driver = MagicMock()
+    mock_driver.current_window_handle = "primary"
+
+    def new_window(kind):
+        mock_driver.current_window_handle = f"tab-{mock_driver.switch_to.new_window.call_count - 1}"
+
+    def switch(handle):
+        mock_driver.current_window_handle = handle
+
+    def execute_script(script, *args):
+        if "readyState" in script:
+            if mock_driver.current_window_handle == "tab-1":
+                raise RuntimeError("document unloaded while waiting for result")
+            return True
+        return None
+
+    # the log covers every tab; the first lane to read it must not take tab 1's bytes
+    logs = [[_loading_finished(512, webview="target-tab-0"), _loading_finished(256, webview="target-tab-1")]]
+    mock_driver.get_log.side_effect = lambda kind: logs.pop() if logs else []
+    mock_driver.execute_cdp_cmd.side_effect = _cdp_per_tab(mock_driver)
+    mock_driver.switch_to.new_window.side_effect = new_window
+    mock_driver.switch_to.window.side_effect = switch
+    mock_driver.execute_script.side_effect = execute_script
+    mock_chrome.return_value = mock_driver
+
+    bot = SeleniumBot(headless=True)
+    trace = bot.run_steps([
+        {
+            "action": "tab_group",
+            "sleep": 0,
+            "tabs": [
+                [{"action": "open", "url": "https://a.example.com"},
+                 {"action": "press", "key": "ENTER"}],
+                [{"action": "open", "url": "https://b.example.com"},
+                 {"action": "press", "key": "ENTER"}],
+            ],
+        }
+    ])
+
+    assert sorted((e.tab, e.action, e.result) for e in trace) == [
+        (0, "open", "success"),
+        (0, "press", "success"),
+        (1, "open", "failure"),
+        (1, "press", "success"),
+    ]
+    failed = next(e for e in trace if e.result == "failure")
+    assert failed.selector == "https://b.example.com"
+    assert "document unloaded" in failed.error
+
+
+def test_extract_page_text_streams_dedupes_and_stops_at_budget():
+    from webnavigator_ai.selenium_bot.extract import (
+        EXTRACT_CLEANUP_JS,
+        EXTRACT_NEXT_JS,
+        extract_page_text,
+    )
+
+    paragraph = "Selenium drives real browsers through the WebDriver protocol."
+    chunks = iter([
+        {"blocks": ["Menu", paragraph, paragraph.upper()], "done": False},
+        {"blocks": [f"{paragraph} Part {i}." for i in range(50)], "done": False},
+        {"blocks": ["never requested"], "done": True},
+    ])
+    calls = []
+
+    def call_js(source, *args):
+        calls.append(source)
+        return next(chunks) if source == EXTRACT_NEXT_JS else True
+
+    extractor = extract_page_text(call_js, token_budget=50)
+    excerpt = extractor.excerpt()
+
+    assert excerpt.startswith(paragraph)
+    assert "Menu" not in excerpt
+    assert extractor.duplicates == 1
+    assert len(excerpt) <= 50 * 4 + 2
+    assert calls.count(EXTRACT_NEXT_JS) == 2
+    assert calls[-1] == EXTRACT_CLEANUP_JS
+
+
+# Just enough DOM for the extraction walker: elements, textContent,
+# tag-list querySelector and a TreeWalker honouring FILTER_REJECT/SKIP.
+_MINI_DOM_JS = """
+const NodeFilter = {SHOW_ELEMENT: 1, FILTER_ACCEPT: 1, FILTER_REJECT: 2, FILTER_SKIP: 3};
+class El {
+  constructor(tagName, children, attrs = {}) {
+    Object.assign(this, {tagName, children, attrs, hidden: false, id: attrs.id || '', className: attrs.class || ''});
+  }
+  getAttribute(name) { return name in this.attrs ? this.attrs[name] : null; }
+  get textContent() {
+    return this.children.map(c => typeof c === 'string' ? c : c.textContent).join(' ');
+  }
+  querySelector(selector) {
+    const tags = selector.split(',');
+    for (const c of this.children) {
+      if (typeof c === 'string') continue;
+      if (tags.includes(c.tagName)) return c;
+      const found = c.querySelector(selector);
+      if (found) return found;
+    }
+    return null;
+  }
+}
+const h = (tag, ...children) => new El(tag, children);
+const window = globalThis;
+const document = {
+  querySelector: () => null,
+  createTreeWalker(root, what, filter) {
+    const nodes = [];
+    const visit = el => {
+      for (const c of el.children) {
+        if (typeof c === 'string') continue;
+        const verdict = filter.acceptNode(c);
+        if (verdict === NodeFilter.FILTER_ACCEPT) nodes.push(c);
+        if (verdict !== NodeFilter.FILTER_REJECT) visit(c);
+      }
+    };
+    visit(root);
+    return {nextNode: () => nodes.shift() || null};
+  },
+};
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the page script")
+def test_extract_walker_emits_only_leaf_most_blocks():
+    from webnavigator_ai.selenium_bot.extract import EXTRACT_INIT_JS, EXTRACT_NEXT_JS
+
+    body = """h('BODY',
+      h('UL', h('LI', h('P', 'Alpha'), h('P', 'Beta'))),
+      h('TABLE', h('TD', h('DIV', h('P', 'Gamma')), h('BLOCKQUOTE', h('P', 'Delta')))),
+      h('NAV', h('P', 'Menu')),
+      h('LI', 'Plain', h('B', 'item')))"""
+    script = (
+        f"{_MINI_DOM_JS}\ndocument.body = {body};\n"
+        f"({EXTRACT_INIT_JS})();\n"
+        f"console.log(JSON.stringify(({EXTRACT_NEXT_JS})(100000)));"
+    )
+    out = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+
+    assert json.loads(out) == {"blocks": ["Alpha", "Beta", "Gamma", "Delta", "Plain item"], "done": True}
+
+
+@patch.object(SeleniumBot, "_resolve_chromedriver", return_value="dummy-path")
+@patch("webnavigator_ai.selenium_bot.browser.webdriver.Chrome")
+def test_step_capture_is_content_addressed_and_deduplicated(mock_chrome, mock_resolve, tmp_path):
+    import base64
+    import gzip
+
+    def execute_cdp_cmd(method, params):
+        if method == "Page.captureScreenshot":
+            return {"data": base64.b64encode(b"jpeg-bytes").decode("ascii")}
+        if method == "Runtime.evaluate":
+            return {"result": {"value": "<html><body>same page</body></html>"}}
+        return {}
+
+    mock_driver = MagicMock()
+    mock_driver.execute_cdp_cmd.side_effect = execute_cdp_cmd
+    mock_chrome.return_value = mock_driver
+
+    bot = SeleniumBot(headless=True, capture_dir=str(tmp_path))
+    trace = bot.run_steps([
+        {"action": "open", "url": "https://example.com", "sleep": 0},
+        {"action": "open", "url": "https://example.com", "sleep": 0},
+    ])
+
+    assert trace[0].screenshot == trace[1].screenshot
+    assert trace[0].dom.endswith(".html.gz")
+    assert trace[0].to_dict()["dom"] == trace[1].dom
+    assert (tmp_path / trace[0].screenshot).read_bytes() == b"jpeg-bytes"
+    assert gzip.decompress((tmp_path / trace[0].dom).read_bytes()) == b"<html><body>same page</body></html>"
+    assert bot.capture.stats() == {"captured": 2, "deduplicated": 2, "dropped": 0, "written": 2}
+
+
+def test_step_capture_drops_frames_when_writer_falls_behind(tmp_path):
+    import threading
+
+    from webnavigator_ai.selenium_bot.capture import StepCapture
+
+    capture = StepCapture(str(tmp_path), screenshots=False, max_queue=1)
+    release = threading.Event()
+    write = capture._write
+    capture._write = lambda name, payload: (release.wait(5), write(name, payload))
+
+    pages = iter(f"<html>{i}</html>" for i in range(10))
+    refs = [
+        capture.capture(lambda method, params: {"result": {"value": next(pages)}})["dom"]
+        for _ in range(10)
+    ]
+    release.set()
+    capture.close()
+
+    assert capture.dropped > 0
+    assert refs.count(None) == capture.dropped
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(r for r in refs if r)
@@ -1,3 +1,6 @@
+import time
+
+from webnavigator_ai.agent.memory import AgentMemory
 from webnavigator_ai.agent.supervisor import SupervisorAgent
 from webnavigator_ai.utils.schema import NormalizedSearchResult
 
@@ -32,3 +35,66 @@ def test_supervisor_agent_selects_url_by_keyword(monkeypatch):
     selected = agent._select_click_url(results, "python selenium tutorial")
 
     assert selected == "https://example.com/selenium"
+
+
+def test_run_job_respects_deadline_and_reports_timed_out_stage(monkeypatch, tmp_path):
+    agent = SupervisorAgent(gemini_key=None)
+    agent.memory = AgentMemory(path=str(tmp_path / "memory.json"))
+
+    class SlowAdapter:
+        api_key = "fake"
+        timeouts = []
+
+        def search(self, query, timeout=10):
+            self.timeouts.append(timeout)
+            time.sleep(0.3)
+            return [
+                NormalizedSearchResult(
+                    title="Slow", snippet="", url="https://slow.example.com", source="test"
+                )
+            ]
+
+    adapter = SlowAdapter()
+    monkeypatch.setattr(agent, "_choose_adapter", lambda: adapter)
+
+    out = agent.run_job("slow query", [{"action": "open", "url": "https://duckduckgo.com"}], timeout=0.2)
+
+    assert adapter.timeouts[0] <= 0.2
+    assert out["timed_out"] == "search"
+    assert len(out["search_results"]) == 1
+    assert [e["result"] for e in out["selenium_trace"]] == ["skipped"] * 3
+    # the budget is spent, so the verdicts come from the local trust index
+    assert out["verification"]["verdicts"][0]["url"] == "https://slow.example.com"
+    assert out["verification"]["summary"].startswith("Local heuristic")
+
+
+def test_backup_candidates_follow_selection_priority():
+    agent = SupervisorAgent(gemini_key=None)
+    results = [
+        NormalizedSearchResult(title="Unrelated", snippet="", url="https://a.com", source="test"),
+        NormalizedSearchResult(title="Docs", snippet="", url="https://docs.b.com", source="test"),
+        NormalizedSearchResult(title="Selenium guide", snippet="", url="https://c.com", source="test"),
+        NormalizedSearchResult(title="Selenium intro", snippet="", url="https://d.com", source="test"),
+    ]
+
+    backups = agent._backup_candidates(results, "selenium", "https://c.com", k=2)
+
+    assert backups == ["https://d.com", "https://docs.b.com"]
+
+
+def test_supervisor_steers_away_from_slow_domain_when_relevance_is_close(monkeypatch, tmp_path):
+    agent = SupervisorAgent(gemini_key=None)
+    agent.memory = AgentMemory(path=str(tmp_path / "memory.json"))
+    for _ in range(3):
+        agent.memory.record_page_load("https://slow.example.com/", load_ms=9000.0, save=False)
+        agent.memory.record_page_load("https://fast.example.com/", load_ms=400.0, save=False)
+
+    results = [
+        NormalizedSearchResult(title="Selenium slow", snippet="", url="https://slow.example.com/s", source="test"),
+        NormalizedSearchResult(title="Selenium fast", snippet="", url="https://fast.example.com/s", source="test"),
+    ]
+
+    assert agent._select_click_url(results, "selenium") == "https://fast.example.com/s"
+
+    agent.latency_window = 1
+    assert agent._select_click_url(results, "selenium") == "https://slow.example.com/s"
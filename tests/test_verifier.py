@@ -1,4 +1,12 @@
+from unittest.mock import MagicMock, patch
 from webnavigator_ai.verifier.gemini_verifier import GeminiVerifier
+from webnavigator_ai.verifier.cache import VerdictCache
+from webnavigator_ai.verifier.trust_index import (
+    DomainTrustIndex,
+    NEUTRAL,
+    TRUSTED,
+    UNTRUSTED,
+)
 from webnavigator_ai.utils.schema import NormalizedSearchResult
 
 
@@ -19,3 +27,118 @@ def test_heuristic_verifier_without_api_key():
     assert "verdicts" in output
     assert output["confidence"] >= 0.5
     assert output["verdicts"][0]["verdict"] in ("likely-true", "uncertain", "unknown")
+
+
+@patch("webnavigator_ai.verifier.gemini_verifier.requests.post")
+def test_gemini_verdicts_are_cached_per_url(mock_post, tmp_path):
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.json.return_value = {
+        "candidates": [
+            {"content": {"parts": [{"text": "1 | likely-true | 0.9\nSUMMARY: Reliable."}]}}
+        ]
+    }
+    mock_post.return_value = mock_response
+
+    cache = VerdictCache(path=str(tmp_path / "verdicts.json"))
+    verifier = GeminiVerifier(api_key="fake-key", cache=cache)
+    results = [
+        NormalizedSearchResult(
+            title="Selenium",
+            snippet="Selenium info",
+            url="https://www.selenium.dev/documentation/",
+            source="test",
+        )
+    ]
+
+    first = verifier.verify_claims(results)
+    assert first["verdicts"][0]["verdict"] == "likely-true"
+    assert first["summary"] == "Reliable."
+    # the file is written on the save interval or at exit, not per call
+    assert not cache.path.exists()
+    cache.save()
+
+    # Same page under a different spelling is served from the reloaded cache
+    results[0].url = "https://selenium.dev/documentation?utm_source=x"
+    verifier = GeminiVerifier(api_key="fake-key", cache=VerdictCache(path=cache.path))
+    second = verifier.verify_claims(results)
+
+    assert mock_post.call_count == 1
+    assert second["cache_hits"] == 1
+    assert second["verdicts"][0]["confidence"] == 0.9
+    assert verifier.cache_stats()["hit_rate"] == 1.0
+
+
+def test_verdict_cache_survives_a_corrupt_file_and_saves_atomically(tmp_path):
+    path = tmp_path / "verdicts.json"
+    path.write_text('{"https://example.com/#abc": [9999999999, {"verd')
+
+    cache = VerdictCache(path=str(path))
+    assert len(cache) == 0
+
+    result = NormalizedSearchResult(title="t", snippet="s", url="https://example.com/", source="test")
+    cache.put(result, {"verdict": "likely-true", "confidence": 0.8})
+    cache.save()
+
+    assert VerdictCache(path=str(path)).get(result)["confidence"] == 0.8
+    assert [p.name for p in tmp_path.iterdir()] == ["verdicts.json"]
+
+
+def test_verdict_cache_saves_only_when_dirty_and_due(tmp_path, monkeypatch):
+    cache = VerdictCache(path=str(tmp_path / "verdicts.json"), save_interval=60)
+    writes = []
+    monkeypatch.setattr(cache._cache, "save", lambda path: writes.append(path))
+    result = NormalizedSearchResult(title="t", snippet="s", url="https://example.com/", source="test")
+
+    cache.save_if_due()
+    cache.put(result, {"verdict": "likely-true", "confidence": 0.8})
+    cache.save_if_due()
+    assert writes == []
+
+    cache._last_save -= 61
+    cache.save_if_due()
+    cache.save_if_due()
+    cache.save()
+    assert len(writes) == 1
+
+
+def test_trust_index_bulk_scoring_from_config(tmp_path):
+    config = tmp_path / "trust.txt"
+    config.write_text(
+        "# suffix tier\n"
+        "wikipedia.org trusted\n"
+        "contentfarm.example untrusted\n"
+        "gov 1\n"
+    )
+    index = DomainTrustIndex.from_file(str(config))
+
+    scored = index.score_urls(
+        [
+            "https://en.wikipedia.org/wiki/Selenium",
+            "http://user@spam.contentfarm.example:8080/page?x=1",
+            "https://data.gov/",
+            "https://example.com/",
+        ]
+        * 1000
+    )
+
+    assert len(scored) == 4000
+    assert list(scored.tiers[:4]) == [TRUSTED, UNTRUSTED, TRUSTED, NEUTRAL]
+    assert scored.counts() == {"trusted": 2000, "neutral": 1000, "untrusted": 1000}
+    assert next(scored.verdicts())["verdict"] == "likely-true"
+
+
+def test_prompt_includes_opened_page_excerpt():
+    verifier = GeminiVerifier(api_key="fake-key", cache=VerdictCache(path=None))
+    results = [
+        NormalizedSearchResult(title="Selenium", snippet="Info", url="https://selenium.dev", source="test")
+    ]
+
+    plain = verifier._build_prompt(results)
+    prompt = verifier._build_prompt(
+        results, page_excerpt="Selenium automates browsers.", page_url="https://selenium.dev"
+    )
+
+    assert "opened page" not in plain
+    assert "(https://selenium.dev)" in prompt
+    assert prompt.endswith("Selenium automates browsers.\n")
@@ -0,0 +1,88 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from webnavigator_ai.agent.memory import AgentMemory
+from webnavigator_ai.agent.supervisor import SupervisorAgent
+from webnavigator_ai.agent.warmer import CacheWarmer
+from webnavigator_ai.utils.schema import NormalizedSearchResult
+from webnavigator_ai.verifier.cache import VerdictCache
+from webnavigator_ai.verifier.gemini_verifier import GeminiVerifier
+
+
+@patch("webnavigator_ai.verifier.gemini_verifier.requests.post")
+def test_warmer_fills_result_and_verdict_caches_within_budget(mock_post, monkeypatch, tmp_path):
+    mock_response = MagicMock()
+    mock_response.json.return_value = {
+        "candidates": [{"content": {"parts": [{"text": "1 | likely-true | 0.9\nSUMMARY: ok"}]}}]
+    }
+    mock_post.return_value = mock_response
+
+    class Adapter:
+        api_key = "fake"
+        calls = []
+
+        def search(self, query, timeout=10):
+            self.calls.append(query)
+            return [NormalizedSearchResult(title=query, snippet=query, url=f"https://{query}.example.com", source="test")]
+
+    agent = SupervisorAgent(gemini_key="fake", result_cache_ttl=3600)
+    agent.memory = AgentMemory(path=str(tmp_path / "memory.json"))
+    agent.verifier = GeminiVerifier(api_key="fake", cache=VerdictCache(path=None))
+    adapter = Adapter()
+    monkeypatch.setattr(agent, "_choose_adapter", lambda: adapter)
+    for query, count in (("alpha", 4), ("beta", 3), ("gamma", 2)):
+        for _ in range(count):
+            agent.memory.remember_query(query, f"https://{query}.example.com")
+
+    report = CacheWarmer(agent, api_budget=4).warm_once()
+
+    assert report == {"warmed": ["alpha", "beta"], "failed": [], "api_calls": 4}
+    name, results, cached = agent.search("Alpha ")
+    assert cached and name == "Adapter"
+    assert agent.verifier.verify_claims(results)["cache_hits"] == 1
+    assert adapter.calls == ["alpha", "beta"]
+    assert mock_post.call_count == 2
+
+
+def test_search_call_cap_stops_fallbacks_and_retries(monkeypatch):
+    monkeypatch.setattr("webnavigator_ai.utils.deadline.Deadline.sleep", lambda self, seconds: None)
+    sent = []
+
+    def failing(name, key):
+        def search(self, query, timeout=10):
+            sent.append(name)
+            raise RuntimeError("HTTP 503")
+        return type(name, (), {"api_key": key, "search": search})()
+
+    agent = SupervisorAgent()
+    agent.tavily = failing("Tavily", "t-key")
+    agent.serpapi = failing("SerpApi", "s-key")
+    agent.serper = type("Serper", (), {"api_key": None, "search": lambda self, q, timeout=10: []})()
+
+    _, results, _ = agent.search("capped", max_calls=4)
+
+    # three tries on the primary, one on the first fallback, none past the cap
+    assert results == []
+    assert sent == ["Tavily"] * 3 + ["SerpApi"]
+    assert agent.search_calls == 4
+
+    # a keyless adapter sends nothing and is not counted
+    agent.tavily.api_key = agent.serpapi.api_key = None
+    agent.search("keyless")
+    assert agent.search_calls == 4
+
+
+def test_off_peak_window_wraps_midnight():
+    warmer = CacheWarmer(agent=None, off_peak_hours=(22, 5))
+
+    assert warmer.is_off_peak(datetime(2026, 1, 1, 23))
+    assert warmer.is_off_peak(datetime(2026, 1, 1, 4))
+    assert not warmer.is_off_peak(datetime(2026, 1, 1, 12))
+
+
+def test_warmed_results_outlive_the_next_peak():
+    warmer = CacheWarmer(agent=None, off_peak_hours=(1, 6), ttl_slack=3600)
+
+    # warmed at 01:00: kept until 02:00 the next day, well past daytime peak
+    assert warmer.warm_ttl(datetime(2026, 1, 1, 1, 0)) == 25 * 3600
+    assert warmer.warm_ttl(datetime(2026, 1, 1, 23, 0)) == 3 * 3600
@@ -5,5 +5,6 @@ from webnavigator_ai.utils.schema import NormalizedSearchResult
 
 class BaseSearchAdapter(ABC):
     @abstractmethod
-    def search(self, query: str) -> List[NormalizedSearchResult]:
+    def search(self, query: str, timeout: float = 10) -> List[NormalizedSearchResult]:
+        """timeout: seconds allowed for the provider HTTP request."""
         ...
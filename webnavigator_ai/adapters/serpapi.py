@@ -1,24 +1,28 @@
 # webnavigator_ai/adapters/serpapi.py
 import os
-import requests
 from typing import List
 from webnavigator_ai.adapters.base import BaseSearchAdapter
 from webnavigator_ai.utils.schema import NormalizedSearchResult
+from webnavigator_ai.utils.lazy import lazy_import
 from webnavigator_ai.utils.logging import setup_logger
 
+requests = lazy_import("requests")
 logger = setup_logger(__name__)
 
 class SerpApiAdapter(BaseSearchAdapter):
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, keep_raw: bool = True, session=None):
+        self.keep_raw = keep_raw
+        # optional requests.Session (e.g. a cassette session); module-level requests otherwise
+        self.http = session or requests
         self.api_key = api_key or os.getenv("SERPAPI_API_KEY")
         self.base = "https://serpapi.com/search.json"
 
-    def search(self, query: str) -> List[NormalizedSearchResult]:
+    def search(self, query: str, timeout: float = 10) -> List[NormalizedSearchResult]:
         if not self.api_key:
             logger.info("SerpApi API key not found, returning empty list (mock).")
             return []
         params = {"q": query, "api_key": self.api_key, "num": 10}
-        resp = requests.get(self.base, params=params, timeout=10)
+        resp = self.http.get(self.base, params=params, timeout=timeout)
         resp.raise_for_status()
         data = resp.json()
         results = []
@@ -30,7 +34,7 @@ class SerpApiAdapter(BaseSearchAdapter):
                     url=item.get("link", ""),
                     source="serpapi",
                     published_at=item.get("date"),
-                    raw=item
+                    raw=item if self.keep_raw else None
                 )
             )
         return results
@@ -1,25 +1,29 @@
 # webnavigator_ai/adapters/serper.py
 import os
-import requests
 from typing import List
 from webnavigator_ai.adapters.base import BaseSearchAdapter
 from webnavigator_ai.utils.schema import NormalizedSearchResult
+from webnavigator_ai.utils.lazy import lazy_import
 from webnavigator_ai.utils.logging import setup_logger
 
+requests = lazy_import("requests")
 logger = setup_logger(__name__)
 
 class SerperAdapter(BaseSearchAdapter):
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, keep_raw: bool = True, session=None):
+        self.keep_raw = keep_raw
+        # optional requests.Session (e.g. a cassette session); module-level requests otherwise
+        self.http = session or requests
         self.api_key = api_key or os.getenv("SERPER_API_KEY")
         self.base = "https://google.serper.dev/search"
 
-    def search(self, query: str) -> List[NormalizedSearchResult]:
+    def search(self, query: str, timeout: float = 10) -> List[NormalizedSearchResult]:
         if not self.api_key:
             logger.info("Serper API key not found, returning empty list (mock).")
             return []
         headers = {"X-API-KEY": self.api_key, "Content-Type": "application/json"}
         payload = {"q": query, "num": 10}
-        resp = requests.post(self.base, json=payload, headers=headers, timeout=10)
+        resp = self.http.post(self.base, json=payload, headers=headers, timeout=timeout)
         resp.raise_for_status()
         data = resp.json()
         results = []
@@ -31,7 +35,7 @@ class SerperAdapter(BaseSearchAdapter):
                     url=item.get("link", ""),
                     source="serper",
                     published_at=item.get("published"),
-                    raw=item
+                    raw=item if self.keep_raw else None
                 )
             )
         return results
@@ -1,11 +1,12 @@
 # webnavigator_ai/adapters/tavily.py
 import os
-import requests
 from typing import List
 from webnavigator_ai.adapters.base import BaseSearchAdapter
 from webnavigator_ai.utils.schema import NormalizedSearchResult
+from webnavigator_ai.utils.lazy import lazy_import
 from webnavigator_ai.utils.logging import setup_logger
 
+requests = lazy_import("requests")
 logger = setup_logger(__name__)
 
 
@@ -15,11 +16,14 @@ class TavilyAdapter(BaseSearchAdapter):
     Official API: https://docs.tavily.com/
     """
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, keep_raw: bool = True, session=None):
+        self.keep_raw = keep_raw
+        # optional requests.Session (e.g. a cassette session); module-level requests otherwise
+        self.http = session or requests
         self.api_key = api_key or os.getenv("TAVILY_API_KEY")
         self.endpoint = "https://api.tavily.com/search"
 
-    def search(self, query: str) -> List[NormalizedSearchResult]:
+    def search(self, query: str, timeout: float = 10) -> List[NormalizedSearchResult]:
         if not self.api_key:
             logger.warning("Tavily API key not found. Skipping Tavily.")
             return []
@@ -32,7 +36,7 @@ class TavilyAdapter(BaseSearchAdapter):
         }
 
         try:
-            resp = requests.post(self.endpoint, json=payload, timeout=10)
+            resp = self.http.post(self.endpoint, json=payload, timeout=timeout)
             resp.raise_for_status()
             data = resp.json()
         except Exception as e:
@@ -47,7 +51,7 @@ class TavilyAdapter(BaseSearchAdapter):
                     snippet=item.get("content", ""),
                     url=item.get("url", ""),
                     source="tavily",
-                    raw=item
+                    raw=item if self.keep_raw else None
                 )
             )
 
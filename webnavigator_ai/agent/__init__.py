@@ -1,2 +1,20 @@
-from .supervisor import SupervisorAgent
-from .memory import AgentMemory
+# Exports are resolved lazily so that ``from webnavigator_ai.agent import
+# AgentMemory`` does not import the search, browser and verifier stacks.
+_EXPORTS = {
+    "SupervisorAgent": "webnavigator_ai.agent.supervisor",
+    "AgentMemory": "webnavigator_ai.agent.memory",
+    "BatchRunner": "webnavigator_ai.agent.batch",
+    "CacheWarmer": "webnavigator_ai.agent.warmer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from webnavigator_ai.utils.limiter import AdaptiveLimiter
+from webnavigator_ai.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# Starting points only; each limit moves with observed latency and errors
+DEFAULT_STAGE_LIMITS = {
+    "search": {"initial": 4, "max_limit": 32},
+    "browser": {"initial": 2, "max_limit": 8},
+    "verify": {"initial": 4, "max_limit": 16},
+}
+
+
+class BatchRunner:
+    """
+    Runs many ``SupervisorAgent.run_job`` calls concurrently.
+
+    There is no fixed worker count to tune: jobs start as fast as threads
+    allow and then queue per stage on AIMD limiters, so in-flight searches,
+    browser sessions and Gemini calls each settle at what that downstream
+    sustains. ``metrics()`` reports the current limits.
+
+    The runner installs its limiters as ``agent.limiters``, replacing any
+    the agent had, and builds the agent's adapters and verifier up front so
+    concurrent jobs share one of each.
+    """
+
+    def __init__(
+        self,
+        agent,
+        limiters: Optional[Dict[str, AdaptiveLimiter]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.agent = agent
+        self.limiters = limiters or {
+            stage: AdaptiveLimiter(stage, **params) for stage, params in DEFAULT_STAGE_LIMITS.items()
+        }
+        agent.limiters = self.limiters
+        agent.build_clients()
+        # enough threads for every stage to reach its ceiling at once
+        self.max_workers = max_workers or int(
+            sum(limiter.max_limit for limiter in self.limiters.values())
+        )
+
+    def _run_one(self, job: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        try:
+            return self.agent.run_job(job["query"], job.get("steps", []), timeout=job.get("timeout", timeout))
+        except Exception as e:
+            logger.warning("Batch job %r failed: %s", job["query"], e)
+            return {"query": job["query"], "error": str(e)}
+
+    def run(self, jobs: Iterable[Dict[str, Any]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        jobs: {"query": str, "steps": [...], "timeout": float?} dicts.
+        Returns run_job outputs in input order; a job that raised is
+        reported as {"query": ..., "error": ...}.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch") as pool:
+            return list(pool.map(lambda job: self._run_one(job, timeout), jobs))
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return self.agent.concurrency_metrics()
@@ -1,38 +1,94 @@
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
+
+from webnavigator_ai.utils.urls import host_of
+
+# Rolling window of recent page loads kept per domain
+DOMAIN_STATS_WINDOW = 50
+# Below this many loads a domain is treated as unknown (no penalty)
+MIN_LATENCY_SAMPLES = 3
+# p90 load time that earns the full latency penalty
+SLOW_LOAD_MS = 8000.0
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[idx]
 
 
 class AgentMemory:
     def __init__(self, path: str = ".agent_memory.json"):
         self.path = Path(path)
         self._data: Dict = self._load()
+        # batch runs share one memory between worker threads
+        self._lock = threading.RLock()
 
     def _load(self) -> Dict:
         if self.path.exists():
-            return json.loads(self.path.read_text())
-        return {"queries": {}, "domains": {}}
+            data = json.loads(self.path.read_text())
+        else:
+            data = {"queries": {}, "domains": {}}
+        data.setdefault("domain_stats", {})
+        query_stats = data.setdefault("query_stats", {})
+        # queries remembered before stats existed: seen once, when the file was last written
+        if len(query_stats) < len(data["queries"]):
+            mtime = self.path.stat().st_mtime
+            for query in data["queries"]:
+                query_stats.setdefault(query, {"count": 1, "last_seen": mtime})
+        return data
 
     def save(self):
-        self.path.write_text(json.dumps(self._data, indent=2))
+        with self._lock:
+            self.path.write_text(json.dumps(self._data, indent=2))
 
     # --------------------------------------------------
     # Query memory
     # --------------------------------------------------
     def remember_query(self, query: str, url: str):
-        self._data["queries"][query.lower()] = url
+        key = query.lower()
+        with self._lock:
+            self._data["queries"][key] = url
+            stats = self._data["query_stats"].setdefault(key, {"count": 0, "last_seen": 0.0})
+            stats["count"] += 1
+            stats["last_seen"] = time.time()
         self.save()
 
     def recall_query(self, query: str) -> Optional[str]:
         return self._data["queries"].get(query.lower())
 
+    def hot_queries(
+        self,
+        limit: int = 50,
+        half_life_hours: float = 72.0,
+        min_count: int = 1,
+    ) -> List[str]:
+        """
+        Remembered queries ranked by request count, decayed by how long ago
+        each was last seen (the weight halves every ``half_life_hours``).
+        """
+        now = time.time()
+        half_life = half_life_hours * 3600
+        with self._lock:
+            scored = [
+                (stats["count"] * 0.5 ** ((now - stats["last_seen"]) / half_life), query)
+                for query, stats in self._data["query_stats"].items()
+                if stats["count"] >= min_count
+            ]
+        scored.sort(reverse=True)
+        return [query for _, query in scored[:limit]]
+
     # --------------------------------------------------
     # Domain memory
     # --------------------------------------------------
     def reinforce_domain(self, url: str):
         domain = url.split("/")[2]
-        self._data["domains"].setdefault(domain, 0)
-        self._data["domains"][domain] += 1
+        with self._lock:
+            self._data["domains"].setdefault(domain, 0)
+            self._data["domains"][domain] += 1
         self.save()
 
     def trusted_domains(self):
@@ -41,3 +97,73 @@ class AgentMemory:
             key=self._data["domains"].get,
             reverse=True,
         )
+
+    # --------------------------------------------------
+    # Domain load telemetry (fed from Selenium traces)
+    # --------------------------------------------------
+    def record_page_load(
+        self,
+        url: str,
+        load_ms: Optional[float] = None,
+        ok: bool = True,
+        bytes: Optional[int] = None,
+        save: bool = True,
+    ):
+        domain = host_of(url)
+        if not domain:
+            return
+        with self._lock:
+            stats = self._data["domain_stats"].setdefault(
+                domain, {"attempts": 0, "failures": 0, "load_ms": [], "bytes": []}
+            )
+            stats["attempts"] += 1
+            if not ok:
+                stats["failures"] += 1
+            if load_ms is not None:
+                stats["load_ms"] = (stats["load_ms"] + [load_ms])[-DOMAIN_STATS_WINDOW:]
+            if bytes is not None:
+                stats["bytes"] = (stats["bytes"] + [bytes])[-DOMAIN_STATS_WINDOW:]
+        if save:
+            self.save()
+
+    def observe_trace(self, trace: Iterable):
+        """Record every attempted ``open`` step of a Selenium trace."""
+        seen = False
+        for event in trace:
+            if event.get("action") != "open" or event.get("result") not in ("success", "failure"):
+                continue
+            self.record_page_load(
+                event.get("selector", ""),
+                load_ms=event.get("load_ms"),
+                ok=event.get("result") == "success",
+                bytes=event.get("bytes"),
+                save=False,
+            )
+            seen = True
+        if seen:
+            self.save()
+
+    def domain_latency(self, url_or_domain: str) -> Optional[Dict]:
+        domain = host_of(url_or_domain) if "://" in url_or_domain else url_or_domain
+        stats = self._data["domain_stats"].get(domain)
+        if not stats or not stats["attempts"]:
+            return None
+        loads = stats["load_ms"]
+        return {
+            "attempts": stats["attempts"],
+            "failure_rate": round(stats["failures"] / stats["attempts"], 3),
+            "p50_ms": _percentile(loads, 0.5) if loads else None,
+            "p90_ms": _percentile(loads, 0.9) if loads else None,
+            "avg_bytes": round(sum(stats["bytes"]) / len(stats["bytes"])) if stats["bytes"] else None,
+        }
+
+    def latency_penalty(self, url: str) -> float:
+        """
+        0.0 (fast and reliable, or not enough data) .. 1.0 (slow and flaky):
+        half from p90 load time relative to SLOW_LOAD_MS, half from failure rate.
+        """
+        stats = self.domain_latency(url)
+        if not stats or stats["attempts"] < MIN_LATENCY_SAMPLES:
+            return 0.0
+        slowness = min((stats["p90_ms"] or 0.0) / SLOW_LOAD_MS, 1.0)
+        return round(0.5 * slowness + 0.5 * stats["failure_rate"], 3)
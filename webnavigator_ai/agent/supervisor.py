@@ -1,24 +1,44 @@
+import logging
+import math
+import os
+import threading
 import time
-from typing import List, Dict, Any
-
-from tenacity import (
-    retry,
-    wait_exponential,
-    stop_after_attempt,
-    retry_if_exception_type,
-)
+import uuid
+from contextlib import contextmanager
+from functools import cached_property
+from typing import List, Dict, Any, Tuple
 
 from webnavigator_ai.adapters.tavily import TavilyAdapter
 from webnavigator_ai.adapters.serpapi import SerpApiAdapter
 from webnavigator_ai.adapters.serper import SerperAdapter
 from webnavigator_ai.selenium_bot.browser import SeleniumBot
+from webnavigator_ai.verifier.cache import VerdictCache
 from webnavigator_ai.verifier.gemini_verifier import GeminiVerifier
 from webnavigator_ai.agent.memory import AgentMemory
-from webnavigator_ai.utils.logging import setup_logger
+from webnavigator_ai.utils.cache import TTLCache
+from webnavigator_ai.utils.deadline import Deadline, DeadlineExceeded
+from webnavigator_ai.utils.limiter import AdaptiveLimiter, SlotOutcome, SlotUnavailable
+from webnavigator_ai.utils.logging import job_context, log_sampled, setup_logger
 from webnavigator_ai.utils.schema import NormalizedSearchResult
 
 logger = setup_logger(__name__)
 
+# Penalty gap (see AgentMemory.latency_penalty) needed to skip a higher-ranked match
+LATENCY_TOLERANCE = 0.15
+
+TRUSTED_URL_HINTS = (
+    "docs",
+    "readthedocs",
+    "tutorial",
+    "learn",
+    "selenium",
+    "python",
+    "github.com",
+    "geeksforgeeks",
+    "w3schools",
+    "realpython",
+)
+
 
 class SupervisorAgent:
     """
@@ -41,19 +61,144 @@ class SupervisorAgent:
         headless: bool = True,
         debugger_address: str | None = None,
         chrome_user_data_dir: str | None = None,
+        keep_raw_results: bool = True,
+        browser_profile: str = "full",
+        browser_backend: str = "selenium",
+        job_timeout: float | None = None,
+        cassette=None,
+        prefetch_candidates: int = 0,
+        latency_window: int = 3,
+        extract_page_content: bool = True,
+        capture_dir: str | None = None,
+        limiters: Dict[str, AdaptiveLimiter] | None = None,
+        result_cache_ttl: float | None = None,
     ):
-        self.tavily = TavilyAdapter(api_key=tavily_key)
-        self.serpapi = SerpApiAdapter(api_key=serp_key)
-        self.serper = SerperAdapter(api_key=serper_key)
-        self.verifier = GeminiVerifier(api_key=gemini_key)
+        """
+        keep_raw_results: keep each provider's raw result payload on the
+        normalized results (and in ``run_job`` output). Disable for batch
+        runs to cut per-job memory and serialization cost.
+        browser_profile: SeleniumBot performance profile ("fast", "balanced", "full").
+        browser_backend: SeleniumBot driver backend ("selenium" or "cdp").
+        job_timeout: default end-to-end time budget (seconds) for ``run_job``.
+        cassette: optional replay.cassette.Cassette to record or replay all search,
+        Gemini and browser traffic (replay runs need no API keys or network).
+        prefetch_candidates: open this many backup URLs in background tabs while
+        the selected page loads, so a failed primary can be swapped instantly.
+        latency_window: how many top matches count as equally relevant when
+        steering away from domains that load slowly or fail (0/1 disables).
+        extract_page_content: pull a bounded, boilerplate-free excerpt of the
+        opened page and give it to the verifier alongside the snippets.
+        capture_dir: directory for per-step screenshots and DOM snapshots
+        (referenced from the trace); disabled when None.
+        limiters: optional concurrency limiters keyed by stage ("search",
+        "browser", "verify"), shared by concurrent ``run_job`` calls; see
+        agent.batch.BatchRunner.
+        result_cache_ttl: opt-in; seconds a query's search results are reused
+        by later jobs. None (default) or 0 keeps every search live. Needed for
+        agent.warmer.CacheWarmer to warm search results.
+        """
+        # Adapters and the verifier are built on first use
+        self._tavily_key = tavily_key
+        self._serp_key = serp_key
+        self._serper_key = serper_key
+        self._gemini_key = gemini_key
+        self.keep_raw_results = keep_raw_results
 
         self.headless = headless
         self.debugger_address = debugger_address
         self.chrome_user_data_dir = chrome_user_data_dir
+        self.browser_profile = browser_profile
+        self.browser_backend = browser_backend
+        self.job_timeout = job_timeout
+        self.cassette = cassette
+        self.prefetch_candidates = prefetch_candidates
+        self.latency_window = max(1, latency_window)
+        self.extract_page_content = extract_page_content
+        self.capture_dir = capture_dir
+        self.limiters: Dict[str, AdaptiveLimiter] = limiters if limiters is not None else {}
+        # normalized query -> (adapter name, results)
+        self.result_cache = TTLCache(max_entries=1024, ttl=result_cache_ttl) if result_cache_ttl else None
+        # search requests sent so far (the cache warmer budgets by this)
+        self.search_calls = 0
+        self._calls_lock = threading.Lock()
 
         # 🧠 Persistent memory
         self.memory = AgentMemory()
 
+    @cached_property
+    def _http_session(self):
+        return self.cassette.session() if self.cassette else None
+
+    def _api_key(self, key: str | None, env_var: str) -> str | None:
+        # Replayed runs take the same code paths as the recording without real keys
+        if self.cassette and self.cassette.replaying:
+            return key or os.getenv(env_var) or "cassette-replay"
+        return key
+
+    @cached_property
+    def tavily(self) -> TavilyAdapter:
+        return TavilyAdapter(
+            api_key=self._api_key(self._tavily_key, "TAVILY_API_KEY"),
+            keep_raw=self.keep_raw_results,
+            session=self._http_session,
+        )
+
+    @cached_property
+    def serpapi(self) -> SerpApiAdapter:
+        return SerpApiAdapter(
+            api_key=self._api_key(self._serp_key, "SERPAPI_API_KEY"),
+            keep_raw=self.keep_raw_results,
+            session=self._http_session,
+        )
+
+    @cached_property
+    def serper(self) -> SerperAdapter:
+        return SerperAdapter(
+            api_key=self._api_key(self._serper_key, "SERPER_API_KEY"),
+            keep_raw=self.keep_raw_results,
+            session=self._http_session,
+        )
+
+    @cached_property
+    def verifier(self) -> GeminiVerifier:
+        return GeminiVerifier(
+            api_key=self._api_key(self._gemini_key, "GEMINI_API_KEY"),
+            # with a cassette, which results reach Gemini must not depend on
+            # a local .verdict_cache.json, or recordings won't replay elsewhere
+            cache=VerdictCache(path=None) if self.cassette else None,
+            session=self._http_session,
+        )
+
+    def build_clients(self) -> "SupervisorAgent":
+        """
+        Build the search adapters and the verifier now instead of on first
+        use. cached_property has no lock, so jobs started concurrently could
+        each build their own verifier (and verdict cache) otherwise.
+        """
+        for name in ("_http_session", "tavily", "serpapi", "serper", "verifier"):
+            getattr(self, name)
+        return self
+
+    # ------------------------------------------------------------------
+    # Per-stage concurrency limits
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _stage_slot(self, stage: str, deadline: Deadline):
+        """Hold a concurrency slot for ``stage`` (no-op without a limiter)."""
+        limiter = self.limiters.get(stage)
+        if limiter is None:
+            yield SlotOutcome()
+            return
+        wait = deadline.remaining()
+        try:
+            with limiter.slot(None if math.isinf(wait) else wait) as outcome:
+                yield outcome
+        except SlotUnavailable:
+            raise DeadlineExceeded(f"No {stage} slot free within the job budget") from None
+
+    def concurrency_metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {stage: limiter.metrics() for stage, limiter in self.limiters.items()}
+
     # ------------------------------------------------------------------
     # Search adapter selection
     # ------------------------------------------------------------------
@@ -66,21 +211,111 @@ class SupervisorAgent:
             return self.serper
         return self.serper  # free-tier fallback
 
-    @retry(
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(Exception),
-    )
-    def _call_search(self, adapter, query: str) -> List[NormalizedSearchResult]:
-        logger.info(
-            "Calling search adapter: %s for query: %s",
-            adapter.__class__.__name__,
-            query,
+    def _call_search(
+        self,
+        adapter,
+        query: str,
+        deadline: Deadline | None = None,
+        call_limit: int | None = None,
+    ) -> List[NormalizedSearchResult]:
+        """call_limit: stop (without retrying) once ``search_calls`` reaches it."""
+        # tenacity is imported here rather than used as a decorator so that
+        # importing the agent does not pay for it
+        from tenacity import (
+            Retrying,
+            wait_exponential,
+            stop_after_attempt,
+            retry_if_exception_type,
+            retry_if_not_exception_type,
         )
-        results = adapter.search(query)
-        if results is None:
-            raise RuntimeError("Search adapter returned None")
-        return results
+
+        deadline = deadline or Deadline()
+
+        def budget_spent(retry_state) -> bool:
+            # no point backing off (min 1s) when there's no budget left to retry
+            return deadline.remaining() < 1
+
+        def calls_spent(retry_state=None) -> bool:
+            return call_limit is not None and self.search_calls >= call_limit
+
+        for attempt in Retrying(
+            wait=wait_exponential(multiplier=1, min=1, max=10),
+            stop=stop_after_attempt(3) | budget_spent | calls_spent,
+            # LookupErrors (missing keys, cassette misses) won't go away on retry
+            retry=retry_if_exception_type(Exception) & retry_if_not_exception_type(LookupError),
+            sleep=deadline.sleep,
+            reraise=True,
+        ):
+            with attempt:
+                log_sampled(
+                    logger,
+                    logging.INFO,
+                    f"search:{adapter.__class__.__name__}",
+                    "Calling search adapter: %s for query: %.80s",
+                    adapter.__class__.__name__,
+                    query,
+                )
+                if adapter.api_key:
+                    # keyless adapters answer locally; only real requests count
+                    with self._calls_lock:
+                        if calls_spent():
+                            raise LookupError("Search call budget spent")
+                        self.search_calls += 1
+                with self._stage_slot("search", deadline):
+                    results = adapter.search(query, timeout=deadline.timeout(10))
+                if results is None:
+                    raise RuntimeError("Search adapter returned None")
+                return results
+
+    def search(
+        self,
+        query: str,
+        deadline: Deadline | None = None,
+        use_cache: bool = True,
+        cache_ttl: float | None = None,
+        max_calls: int | None = None,
+    ) -> Tuple[str, List[NormalizedSearchResult], bool]:
+        """
+        Search with adapter fallback, reusing recent results for the same
+        query. Returns (adapter name, results, served_from_cache); non-empty
+        fresh results are stored in the result cache, for ``cache_ttl``
+        seconds if given, else ``result_cache_ttl``. ``max_calls`` caps the
+        requests sent across all adapters and retries.
+        """
+        deadline = deadline or Deadline()
+        call_limit = None if max_calls is None else self.search_calls + max_calls
+        key = " ".join(query.lower().split())
+        if use_cache and self.result_cache is not None:
+            hit = self.result_cache.get(key)
+            if hit is not None:
+                return hit[0], hit[1], True
+
+        adapter = self._choose_adapter()
+        try:
+            search_results = self._call_search(adapter, query, deadline, call_limit)
+        except Exception as e:
+            logger.exception("Primary search failed: %s", e)
+            search_results = []
+
+        # Fallback adapters
+        if not search_results:
+            tried = {adapter.__class__.__name__}
+            for cand in (self.tavily, self.serpapi, self.serper):
+                if call_limit is not None and self.search_calls >= call_limit:
+                    break
+                if cand.__class__.__name__ in tried or deadline.expired():
+                    continue
+                try:
+                    search_results = self._call_search(cand, query, deadline, call_limit)
+                    if search_results:
+                        adapter = cand
+                        break
+                except Exception:
+                    continue
+
+        if search_results and self.result_cache is not None:
+            self.result_cache.put(key, (adapter.__class__.__name__, search_results), ttl=cache_ttl)
+        return adapter.__class__.__name__, search_results, False
 
     # ------------------------------------------------------------------
     # 🧠 AGENT DECISION LOGIC (Memory + Reasoning)
@@ -111,35 +346,75 @@ class SupervisorAgent:
         keywords = [k.lower() for k in query.split()]
 
         # 1️⃣ Keyword match
-        for r in results:
-            haystack = f"{r.title} {r.url}".lower()
-            if any(k in haystack for k in keywords):
-                logger.info("Agent selected URL by keyword match: %s", r.url)
-                return r.url
+        matches = [
+            r for r in results
+            if any(k in f"{r.title} {r.url}".lower() for k in keywords)
+        ]
+        if matches:
+            url = self._prefer_fast_domain(matches)
+            logger.info("Agent selected URL by keyword match: %s", url)
+            return url
 
         # 2️⃣ Trusted domains
-        trusted_domains = (
-            "docs",
-            "readthedocs",
-            "tutorial",
-            "learn",
-            "selenium",
-            "python",
-            "github.com",
-            "geeksforgeeks",
-            "w3schools",
-            "realpython",
-        )
-
-        for r in results:
-            if any(d in r.url.lower() for d in trusted_domains):
-                logger.info("Agent selected URL by trusted domain: %s", r.url)
-                return r.url
+        matches = [
+            r for r in results
+            if any(d in r.url.lower() for d in TRUSTED_URL_HINTS)
+        ]
+        if matches:
+            url = self._prefer_fast_domain(matches)
+            logger.info("Agent selected URL by trusted domain: %s", url)
+            return url
 
         # 3️⃣ Fallback
         logger.info("Agent fallback URL: %s", results[0].url)
         return results[0].url
 
+    def _prefer_fast_domain(self, matches: List[NormalizedSearchResult]) -> str:
+        """
+        Among the top ``latency_window`` equally relevant matches, move off the
+        first one only if memory says its domain is clearly slower or flakier.
+        """
+        window = matches[: self.latency_window]
+        first = window[0]
+        penalties = {r.url: self.memory.latency_penalty(r.url) for r in window}
+        best = min(window, key=lambda r: penalties[r.url])  # min keeps the first on ties
+        if penalties[first.url] - penalties[best.url] < LATENCY_TOLERANCE:
+            return first.url
+        logger.info(
+            "Agent skipped slow/flaky %s (penalty %.2f) for %s (penalty %.2f)",
+            first.url, penalties[first.url], best.url, penalties[best.url],
+        )
+        return best.url
+
+    def _backup_candidates(
+        self,
+        results: List[NormalizedSearchResult],
+        query: str,
+        selected: str,
+        k: int,
+    ) -> List[str]:
+        """
+        Next-best URLs after ``selected``, in the same priority order as
+        ``_select_click_url`` (keyword match, trusted domain, result order).
+        """
+        keywords = [kw.lower() for kw in query.split()]
+
+        def priority(r: NormalizedSearchResult) -> int:
+            if any(kw in f"{r.title} {r.url}".lower() for kw in keywords):
+                return 0
+            if any(d in r.url.lower() for d in TRUSTED_URL_HINTS):
+                return 1
+            return 2
+
+        ranked = sorted(results, key=priority)  # stable: keeps result order within a tier
+        backups: List[str] = []
+        for r in ranked:
+            if r.url and r.url != selected and r.url not in backups:
+                backups.append(r.url)
+            if len(backups) >= k:
+                break
+        return backups
+
     # ------------------------------------------------------------------
     # Main job runner
     # ------------------------------------------------------------------
@@ -147,6 +422,7 @@ class SupervisorAgent:
         self,
         query: str,
         steps: List[Dict[str, Any]],
+        timeout: float | None = None,
     ) -> Dict[str, Any]:
         """
         Full pipeline:
@@ -154,30 +430,32 @@ class SupervisorAgent:
         - Agent selects best URL (memory-aware)
         - Selenium navigates directly (visual & robust)
         - Gemini verification
+
+        timeout: end-to-end budget in seconds (defaults to ``job_timeout``).
+        Every stage only gets what is left of it; when it runs out the
+        remaining work is skipped and ``timed_out`` names the stage that
+        was cut short.
         """
+        job_id = uuid.uuid4().hex[:12]
+        with job_context(job_id):
+            output = self._run_job(query, steps, timeout)
+        output["job_id"] = job_id
+        return output
 
-        adapter = self._choose_adapter()
+    def _run_job(
+        self,
+        query: str,
+        steps: List[Dict[str, Any]],
+        timeout: float | None,
+    ) -> Dict[str, Any]:
+        deadline = Deadline(timeout if timeout is not None else self.job_timeout)
+        timed_out = None
 
         # ---------------- Search ----------------
-        try:
-            search_results = self._call_search(adapter, query)
-        except Exception as e:
-            logger.exception("Primary search failed: %s", e)
-            search_results = []
+        adapter_name, search_results, search_cached = self.search(query, deadline)
 
-        # Fallback adapters
-        if not search_results:
-            tried = {adapter.__class__.__name__}
-            for cand in (self.tavily, self.serpapi, self.serper):
-                if cand.__class__.__name__ in tried:
-                    continue
-                try:
-                    search_results = self._call_search(cand, query)
-                    if search_results:
-                        adapter = cand
-                        break
-                except Exception:
-                    continue
+        if deadline.expired():
+            timed_out = "search"
 
         # ---------------- Agent decision ----------------
         selected_url = self._select_click_url(search_results, query)
@@ -186,13 +464,18 @@ class SupervisorAgent:
 
         # ✅ Robust navigation (no SERP DOM dependency)
         if selected_url:
-            final_steps.append(
-                {
-                    "action": "open",
-                    "url": selected_url,
-                    "sleep": 1.5,
-                }
-            )
+            open_step = {
+                "action": "open",
+                "url": selected_url,
+                "sleep": 1.5,
+            }
+            if self.prefetch_candidates:
+                open_step["prefetch"] = self._backup_candidates(
+                    search_results, query, selected_url, self.prefetch_candidates
+                )
+            final_steps.append(open_step)
+            if self.extract_page_content:
+                final_steps.append({"action": "extract", "sleep": 0})
 
             # 🧠 Store memory
             self.memory.remember_query(query, selected_url)
@@ -203,18 +486,62 @@ class SupervisorAgent:
             headless=self.headless,
             debugger_address=self.debugger_address,
             chrome_user_data_dir=self.chrome_user_data_dir,
+            profile=self.browser_profile,
+            backend=self.browser_backend,
+            cassette=self.cassette,
+            capture_dir=self.capture_dir,
         )
 
-        selenium_trace = browser.run_steps(final_steps)
+        try:
+            with self._stage_slot("browser", deadline) as outcome:
+                selenium_trace = browser.run_steps(final_steps, deadline=deadline)
+                # Judge the pool by page loads, not by the job's wall time (Chrome
+                # startup, step sleeps, step count). Deadline-clipped loads are
+                # "skipped", so a remaining timeout means the browsers are overloaded.
+                loads = [e.load_ms for e in selenium_trace if e.action == "open" and e.load_ms is not None]
+                outcome.latency = sum(loads) / len(loads) / 1000 if loads else None
+                outcome.ok = not any(
+                    e.result == "failure" and "timeout" in (e.error or "").lower()
+                    for e in selenium_trace
+                )
+                if not outcome.ok and outcome.latency is None:
+                    outcome.latency = 0.0
+        except DeadlineExceeded:
+            selenium_trace = browser._skipped(final_steps)
+        self.memory.observe_trace(selenium_trace)
+        if timed_out is None and any(
+            e.result == "skipped" and (e.error or "").startswith("deadline exceeded")
+            for e in selenium_trace
+        ):
+            timed_out = "browser"
 
         # ---------------- Verification ----------------
-        verification = self.verifier.verify_claims(search_results)
+        page_url = next(
+            (e.selector for e in selenium_trace if e.action == "extract" and e.result == "success"),
+            None,
+        )
+        try:
+            verification = self.verifier.verify_claims(
+                search_results,
+                timeout=deadline.timeout(20),
+                page_excerpt=browser.page_texts.get(page_url),
+                page_url=page_url,
+                limiter=self.limiters.get("verify"),
+            )
+        except DeadlineExceeded:
+            # no budget left for Gemini; the trust index needs no network call
+            verification = self.verifier._heuristic_verify(search_results)
+        if timed_out is None and deadline.expired():
+            timed_out = "verification"
 
         return {
             "query": query,
-            "search_adapter_used": adapter.__class__.__name__,
+            "search_adapter_used": adapter_name,
+            "search_cached": search_cached,
             "search_results": [r.to_dict() for r in search_results],
-            "selenium_trace": selenium_trace,
+            "selenium_trace": [e.to_dict() for e in selenium_trace],
+            "browser_metrics": browser.metrics_summary(selenium_trace),
             "verification": verification,
+            "timed_out": timed_out,
             "timestamp": time.time(),
         }
@@ -0,0 +1,144 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from webnavigator_ai.utils.deadline import Deadline
+from webnavigator_ai.utils.logging import job_context, setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CacheWarmer:
+    """
+    Re-runs search and verification for the most requested queries during
+    off-peak hours, so the supervisor's result cache and the verifier's
+    verdict cache are warm when traffic picks up.
+
+    Queries come from ``AgentMemory.hot_queries`` (request count decayed by
+    recency). Each pass spends at most ``api_budget`` search + Gemini
+    requests: adapter fallbacks and retries stop once the searches would eat
+    into the one Gemini request a query still needs.
+
+    Search results are only warmed when the agent has a result cache
+    (``SupervisorAgent(result_cache_ttl=...)``); otherwise only verdicts are.
+    Warmed search results are kept until the next off-peak window opens
+    (plus ``ttl_slack``), however short ``result_cache_ttl`` is, so they
+    outlive the peak. The result cache is in-memory: the warmer must run in
+    the process that serves the jobs, e.g. via ``start()`` next to it. The
+    verdict cache is persisted and can be warmed from anywhere.
+    """
+
+    def __init__(
+        self,
+        agent,
+        api_budget: int = 200,
+        top_k: int = 100,
+        off_peak_hours: Tuple[int, int] = (1, 6),
+        half_life_hours: float = 72.0,
+        min_count: int = 1,
+        query_timeout: float = 30.0,
+        ttl_slack: float = 3600.0,
+    ):
+        """
+        off_peak_hours: local (start, end) hours, end exclusive; may wrap
+        past midnight, e.g. (22, 5).
+        ttl_slack: extra seconds warmed results live past the next window's start.
+        """
+        self.agent = agent
+        self.api_budget = api_budget
+        self.top_k = top_k
+        self.off_peak_hours = off_peak_hours
+        self.half_life_hours = half_life_hours
+        self.min_count = min_count
+        self.query_timeout = query_timeout
+        self.ttl_slack = ttl_slack
+        if agent is not None and agent.result_cache is None:
+            logger.warning("Agent has no result cache (result_cache_ttl); only verdicts will be warmed")
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_run_day = None
+
+    def is_off_peak(self, when: Optional[datetime] = None) -> bool:
+        hour = (when or datetime.now()).hour
+        start, end = self.off_peak_hours
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def warm_ttl(self, now: Optional[datetime] = None) -> float:
+        """Seconds from ``now`` until the next off-peak window starts, plus slack."""
+        now = now or datetime.now()
+        start = now.replace(hour=self.off_peak_hours[0], minute=0, second=0, microsecond=0)
+        if start <= now:
+            start += timedelta(days=1)
+        return (start - now).total_seconds() + self.ttl_slack
+
+    def plan(self) -> List[str]:
+        return self.agent.memory.hot_queries(
+            limit=self.top_k,
+            half_life_hours=self.half_life_hours,
+            min_count=self.min_count,
+        )
+
+    def _api_calls(self) -> int:
+        return self.agent.search_calls + self.agent.verifier.api_calls
+
+    def warm_once(self, budget: Optional[int] = None) -> Dict[str, Any]:
+        """One pass over the hot queries; returns what was warmed and spent."""
+        budget = self.api_budget if budget is None else budget
+        started_calls = self._api_calls()
+        ttl = self.warm_ttl()
+        warmed: List[str] = []
+        failed: List[str] = []
+
+        with job_context("cache-warmer"):
+            for query in self.plan():
+                # each query needs at least one search and one Gemini request
+                left = budget - (self._api_calls() - started_calls)
+                if left < 2:
+                    break
+                deadline = Deadline(self.query_timeout)
+                _, results, _ = self.agent.search(
+                    query, deadline, use_cache=False, cache_ttl=ttl, max_calls=left - 1
+                )
+                if not results:
+                    failed.append(query)
+                    continue
+                if not deadline.expired():
+                    self.agent.verifier.verify_claims(results, timeout=deadline.timeout(20))
+                warmed.append(query)
+
+        # persist the warmed verdicts now rather than at the next interval
+        self.agent.verifier.cache.save()
+        spent = self._api_calls() - started_calls
+        logger.info("Cache warmer refreshed %d queries using %d API calls", len(warmed), spent)
+        return {"warmed": warmed, "failed": failed, "api_calls": spent}
+
+    # ------------------------------------------------------------------
+    # Schedule
+    # ------------------------------------------------------------------
+    def start(self, check_interval: float = 300.0) -> "CacheWarmer":
+        """Run one pass per day, at the first check inside the off-peak window."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, args=(check_interval,), name="cache-warmer", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _loop(self, check_interval: float):
+        while not self._stop.is_set():
+            now = datetime.now()
+            if self.is_off_peak(now) and self._last_run_day != now.date():
+                self._last_run_day = now.date()
+                try:
+                    self.warm_once()
+                except Exception as e:
+                    logger.warning("Cache warmer pass failed: %s", e)
+            self._stop.wait(check_interval)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,226 @@
+# webnavigator_ai/replay/cassette.py
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from webnavigator_ai.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# Never written to disk and never part of a match key
+SECRET_FIELDS = {"api_key", "apikey", "key", "token", "access_token"}
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+def _strip_secrets_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_FIELDS]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+
+
+def _strip_secrets_body(body) -> str:
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if isinstance(data, dict):
+        data = {k: v for k, v in data.items() if k.lower() not in SECRET_FIELDS}
+    return json.dumps(data, sort_keys=True)
+
+
+def request_key(method: str, url: str, body=None) -> str:
+    material = f"{method.upper()} {_strip_secrets_url(url)}\n{_strip_secrets_body(body)}"
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+
+def _encode_body(body: bytes) -> Dict[str, str]:
+    try:
+        return {"text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(body).decode("ascii")}
+
+
+def decode_body(entry: Dict) -> bytes:
+    if "b64" in entry:
+        return base64.b64decode(entry["b64"])
+    return entry.get("text", "").encode("utf-8")
+
+
+class Cassette:
+    """
+    Recorded adapter/Gemini HTTP exchanges and visited pages, stored as one
+    gzip-compressed JSONL file.
+
+    mode="record" captures traffic through ``session()`` and
+    ``record_resource()`` and writes it on ``save()``; mode="replay" serves
+    the same traffic back without touching the network. With
+    ``simulate_latency`` replayed responses wait for their recorded latency.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", simulate_latency: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Cassette mode must be 'record' or 'replay', got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self._lock = threading.Lock()
+        self._entries: List[Dict] = []
+        self._http: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self._resources: Dict[str, Dict] = {}
+        if mode == "replay":
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc):
+        if self.recording:
+            self.save()
+
+    # --------------------------------------------------
+    # Storage
+    # --------------------------------------------------
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    self._index(json.loads(line))
+        logger.info("Loaded cassette %s (%d entries)", self.path, len(self._entries))
+
+    def _index(self, entry: Dict):
+        self._entries.append(entry)
+        if entry["kind"] == "http":
+            self._http[entry["key"]].append(entry)
+        else:
+            self._resources.setdefault(entry["url"], entry)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, gzip.open(self.path, "wt", encoding="utf-8") as fh:
+            for entry in self._entries:
+                fh.write(json.dumps(entry, separators=(",", ":")))
+                fh.write("\n")
+
+    def wait(self, entry: Dict):
+        if self.simulate_latency:
+            time.sleep(entry.get("latency", 0.0))
+
+    # --------------------------------------------------
+    # HTTP exchanges (search adapters, Gemini)
+    # --------------------------------------------------
+    def record_http(self, request, response, latency: float):
+        entry = {
+            "kind": "http",
+            "key": request_key(request.method, request.url, request.body),
+            "method": request.method,
+            "url": _strip_secrets_url(request.url),
+            "status": response.status_code,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+            "latency": round(latency, 4),
+            **_encode_body(response.content),
+        }
+        with self._lock:
+            self._index(entry)
+
+    def replay_http(self, request) -> Dict:
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            queue = self._http.get(key)
+            if not queue:
+                raise CassetteMiss(f"No recorded response for {request.method} {_strip_secrets_url(request.url)}")
+            # Repeated identical requests replay in recorded order; the last one sticks
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def session(self) -> requests.Session:
+        s = requests.Session()
+        transport = CassetteTransport(self)
+        s.mount("http://", transport)
+        s.mount("https://", transport)
+        return s
+
+    # --------------------------------------------------
+    # Browser pages and subresources
+    # --------------------------------------------------
+    def record_resource(
+        self,
+        url: str,
+        body: bytes,
+        content_type: str,
+        status: int = 200,
+        latency: float = 0.0,
+        kind: str = "resource",
+    ):
+        entry = {
+            "kind": kind,
+            "url": url,
+            "status": status,
+            "headers": {"Content-Type": content_type},
+            "latency": round(latency, 4),
+            **_encode_body(body),
+        }
+        with self._lock:
+            self._index(entry)
+
+    def resource(self, url: str) -> Optional[Dict]:
+        return self._resources.get(url)
+
+    def resources(self) -> Iterator[Dict]:
+        return iter(self._resources.values())
+
+
+class CassetteTransport(BaseAdapter):
+    """requests transport adapter that records through, or replays from, a cassette."""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+        self._real = HTTPAdapter() if cassette.recording else None
+
+    def send(self, request, **kwargs):
+        if self.cassette.recording:
+            started = time.perf_counter()
+            response = self._real.send(request, **kwargs)
+            self.cassette.record_http(request, response, time.perf_counter() - started)
+            return response
+
+        entry = self.cassette.replay_http(request)
+        self.cassette.wait(entry)
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = decode_body(entry)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        return response
+
+    def close(self):
+        if self._real:
+            self._real.close()
@@ -0,0 +1,129 @@
+# webnavigator_ai/replay/server.py
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from webnavigator_ai.replay.cassette import Cassette, decode_body
+
+# Served URLs look like /__host__/<netloc>/<path>, so sites sharing a path don't collide
+HOST_PREFIX = "/__host__/"
+
+# Root-relative references in HTML attributes and CSS url(...)
+_ROOT_RELATIVE = re.compile(r"""((?:href|src|action)\s*=\s*["']|url\(\s*["']?)/(?!/)""")
+
+
+def _path_of(url: str) -> str:
+    parts = urlsplit(url)
+    return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+
+def _local_path(url: str) -> str:
+    return f"{HOST_PREFIX}{urlsplit(url).netloc}{_path_of(url)}"
+
+
+def _host_of_local(path: str) -> Optional[str]:
+    if not path.startswith(HOST_PREFIX):
+        return None
+    return path[len(HOST_PREFIX):].split("/", 1)[0] or None
+
+
+class ReplayServer:
+    """
+    Local stand-in for recorded websites. Pages and subresources are served
+    from a cassette under ``/__host__/<netloc>/<path>``. Absolute links to
+    recorded hosts and root-relative links are rewritten to that form, so the
+    browser keeps talking to this server and each site keeps its own paths.
+    Other root-relative requests (e.g. from scripts) are resolved against
+    the Referer's host, or by path when only one recorded host has it.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._by_local: Dict[str, Dict] = {}
+        self._hosts_by_path: Dict[str, set] = {}
+        hosts = set()
+        for entry in cassette.resources():
+            # pages win over subresources recorded under the same URL
+            local = _local_path(entry["url"])
+            if entry["kind"] == "page" or local not in self._by_local:
+                self._by_local[local] = entry
+            host = urlsplit(entry["url"]).netloc
+            self._hosts_by_path.setdefault(_path_of(entry["url"]), set()).add(host)
+            hosts.add(host)
+        self._prefixes = sorted(
+            (
+                (f"{scheme}{host}", f"{HOST_PREFIX}{host}")
+                for host in hosts
+                for scheme in ("https://", "http://", "//")
+            ),
+            key=lambda p: len(p[0]),
+            reverse=True,
+        )
+        self._rewritten: Dict[str, bytes] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> "ReplayServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                entry = server._lookup(self.path, self.headers.get("Referer", ""))
+                if entry is None:
+                    self.send_error(404, "Not recorded")
+                    return
+                body = server._body(entry)
+                server.cassette.wait(entry)
+                self.send_response(entry["status"])
+                self.send_header("Content-Type", entry["headers"].get("Content-Type", ""))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def url_for(self, url: str) -> str:
+        return self.base_url + _local_path(url)
+
+    def _lookup(self, path: str, referer: str) -> Optional[Dict]:
+        entry = self._by_local.get(path)
+        if entry is not None or path.startswith(HOST_PREFIX):
+            return entry
+        host = _host_of_local(urlsplit(referer).path)
+        if host is None:
+            hosts = self._hosts_by_path.get(path, ())
+            if len(hosts) != 1:
+                return None
+            host = next(iter(hosts))
+        return self._by_local.get(f"{HOST_PREFIX}{host}{path}")
+
+    def _body(self, entry: Dict) -> bytes:
+        body = decode_body(entry)
+        content_type = entry["headers"].get("Content-Type", "")
+        if "html" not in content_type and "css" not in content_type:
+            return body
+        cached = self._rewritten.get(entry["url"])
+        if cached is None:
+            text = body.decode("utf-8", "replace")
+            own_host = f"{HOST_PREFIX}{urlsplit(entry['url']).netloc}"
+            text = _ROOT_RELATIVE.sub(lambda m: f"{m.group(1)}{own_host}/", text)
+            for prefix, local in self._prefixes:
+                text = text.replace(prefix, local)
+            cached = self._rewritten[entry["url"]] = text.encode("utf-8")
+        return cached
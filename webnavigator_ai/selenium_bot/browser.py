@@ -1,21 +1,59 @@
 # webnavigator_ai/selenium_bot/browser.py
+import json
+import logging
 import time
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 from urllib.parse import urlparse, parse_qs, unquote
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-
-from webnavigator_ai.utils.logging import setup_logger
-from webnavigator_ai.utils.schema import timestamp_iso
+from webnavigator_ai.selenium_bot.capture import StepCapture
+from webnavigator_ai.selenium_bot.cdp import CDPDriver
+from webnavigator_ai.selenium_bot.extract import extract_page_text
+from webnavigator_ai.selenium_bot.profiles import BrowserProfile, get_profile
+from webnavigator_ai.utils.deadline import Deadline
+from webnavigator_ai.utils.lazy import lazy_import
+from webnavigator_ai.utils.logging import log_sampled, setup_logger
+from webnavigator_ai.utils.schema import TraceEvent, timestamp_iso
 
+# selenium is only imported once a browser is actually started
+webdriver = lazy_import("selenium.webdriver")
+requests = lazy_import("requests")
 logger = setup_logger(__name__)
 
+# Subresources fetched per page when recording a cassette
+MAX_RECORDED_RESOURCES = 150
+
+# A step failing this close to the job deadline was clipped by it
+DEADLINE_SLACK = 0.5
+
+# Steps that may leave the page; the page they land on is recorded too
+NAVIGATING_ACTIONS = ("press", "click_dynamic")
+
+# Tab-group navigation: flag the old document so the poll below can tell it
+# apart from the new one, whose readyState starts out as "loading".
+_NAVIGATE_JS = "window.__webnavPendingNav = true; window.location.href = arguments[0];"
+_NAVIGATION_DONE_JS = (
+    "return !window.__webnavPendingNav && document.readyState !== 'loading';"
+)
+
+# Load time of the current document from its own navigation entry, for
+# tabs that loaded in the background
+_NAVIGATION_MS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd || nav.responseEnd) : null;
+"""
+
+_RESOURCE_URLS_JS = """
+return performance.getEntriesByType('resource')
+    .map(e => e.name)
+    .filter(n => n.startsWith('http'));
+"""
+
+# CDP event whose encodedDataLength is the bytes a response took on the wire
+# (headers included, 0 when served from cache), whatever its origin
+LOADING_FINISHED = "Network.loadingFinished"
+
 
 class SeleniumBot:
     def __init__(
@@ -24,18 +62,55 @@ class SeleniumBot:
         implicit_wait: int = 5,
         debugger_address: Optional[str] = None,
         chrome_user_data_dir: Optional[str] = None,
+        profile: Union[str, BrowserProfile] = "full",
+        backend: str = "selenium",
+        cassette=None,
+        max_prefetch_tabs: int = 3,
+        prefetch_max_heap_mb: float = 512,
+        capture_dir: Optional[str] = None,
     ):
         """
         debugger_address: if provided, connect to an existing Chrome with remote debugging (host:port).
         chrome_user_data_dir: optional path to a Chrome profile directory when launching Chrome.
+        profile: performance profile ("fast", "balanced", "full" or a BrowserProfile)
+            controlling page-load strategy and resource blocking.
+        backend: "selenium" (via chromedriver) or "cdp" (DevTools websocket, no chromedriver hop).
+        cassette: optional replay.cassette.Cassette; in record mode visited pages and their
+            subresources are captured, in replay mode they are served from a local server.
+        max_prefetch_tabs / prefetch_max_heap_mb: bounds for speculative background tabs
+            opened by an "open" step's "prefetch" list (selenium backend only); the heap
+            bound is checked against the JS heap of the prefetched tabs combined.
+        capture_dir: if set, a screenshot and DOM snapshot are taken after every
+            step and written there in the background; trace events reference them
+            by content-addressed filename.
         """
+        if backend not in ("selenium", "cdp"):
+            raise ValueError(f"Unknown SeleniumBot backend {backend!r}")
         self.headless = headless
         self.implicit_wait = implicit_wait
         self.debugger_address = debugger_address
         self.chrome_user_data_dir = chrome_user_data_dir
+        self.profile = get_profile(profile)
+        self.backend = backend
         self.driver = None
+        self.cdp: Optional[CDPDriver] = None
+        self.cassette = cassette
+        self._replay_server = None
+        self.max_prefetch_tabs = max_prefetch_tabs
+        self.prefetch_max_heap_mb = prefetch_max_heap_mb
+        self._prefetched: List[tuple] = []  # (window handle, url)
+        # url -> boilerplate-free text excerpt, filled by "extract" steps
+        self.page_texts: Dict[str, str] = {}
+        self._last_opened_url: Optional[str] = None
+        self._last_recorded_url: Optional[str] = None
+        # performance-log byte tallies not yet collected, per DevTools target
+        self._bytes_by_target: Dict[Optional[str], int] = {}
+        self._target_ids: Dict[str, str] = {}  # window handle -> target id
+        self.capture = StepCapture(capture_dir) if capture_dir else None
 
     def _resolve_chromedriver(self) -> str:
+        from webdriver_manager.chrome import ChromeDriverManager
+
         raw_path = Path(ChromeDriverManager().install())
         if raw_path.name.lower() == "chromedriver.exe":
             return str(raw_path)
@@ -48,6 +123,9 @@ class SeleniumBot:
         raise RuntimeError(f"Could not locate chromedriver.exe in {parent_dir}")
 
     def _init_driver(self):
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service as ChromeService
+
         chrome_options = Options()
 
         # If connecting to an existing Chrome via remote debugging, set debugger address
@@ -62,9 +140,19 @@ class SeleniumBot:
             if self.chrome_user_data_dir:
                 chrome_options.add_argument(f"--user-data-dir={self.chrome_user_data_dir}")
 
+            for arg in self.profile.chrome_arguments():
+                chrome_options.add_argument(arg)
+            if self.profile.disable_images:
+                chrome_options.add_experimental_option(
+                    "prefs", {"profile.managed_default_content_settings.images": 2}
+                )
+
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.page_load_strategy = self.profile.page_load_strategy
+        # Network.* events in the performance log are how page bytes are measured
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
         driver_path = self._resolve_chromedriver()
         logger.info("Using ChromeDriver: %s", driver_path)
@@ -73,140 +161,701 @@ class SeleniumBot:
         # When using debuggerAddress, chromedriver will attach to existing Chrome
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         self.driver.implicitly_wait(self.implicit_wait)
+        self._apply_blocklist()
+
+    def _init_cdp(self):
+        self.cdp = CDPDriver(
+            debugger_address=self.debugger_address,
+            headless=self.headless,
+            chrome_user_data_dir=self.chrome_user_data_dir,
+            profile=self.profile,
+        )
+        self.cdp.start()
+
+    def _run_cdp_step(self, step: Dict, ts: str, deadline: Deadline) -> TraceEvent:
+        action = step.get("action")
+
+        if action == "open":
+            self._last_opened_url = None
+            self._page_bytes()  # drop what earlier steps loaded
+            started = time.perf_counter()
+            self.cdp.open(self._resolve_url(step["url"]), timeout=deadline.timeout(30))
+            load_ms = round((time.perf_counter() - started) * 1000, 1)
+            self._last_opened_url = step["url"]
+            if self.cassette and self.cassette.recording:
+                self._record_page(step["url"], load_ms)
+            return TraceEvent(
+                action="open",
+                selector=step["url"],
+                timestamp=ts,
+                result="success",
+                load_ms=load_ms,
+                bytes=self._page_bytes(),
+            )
+
+        # element lookups wait like chromedriver's implicit wait, within the job budget
+        if action == "type":
+            self.cdp.type(step["selector"], step.get("text", ""), timeout=deadline.timeout(self.implicit_wait))
+            return TraceEvent(action="type", selector=step["selector"], timestamp=ts, result="success")
+
+        if action == "press":
+            key = step.get("key", "ENTER").upper()
+            self.cdp.press(key, timeout=deadline.timeout(30))
+            return TraceEvent(action="press", selector=key, timestamp=ts, result="success")
+
+        if action == "extract":
+            return self._extract_step(step, ts, self._last_opened_url)
+
+        if action == "click_dynamic":
+            target_domain = urlparse(step["url"]).netloc.replace("www.", "")
+            clicked = self.cdp.click_dynamic(target_domain, timeout=deadline.timeout(self.implicit_wait))
+            if not clicked:
+                raise RuntimeError(f"No DuckDuckGo result matched target domain: {target_domain}")
+            return TraceEvent(action="click_dynamic", selector=clicked, timestamp=ts, result="success")
+
+        return TraceEvent(action=action, selector="", timestamp=ts, result="unknown-action")
+
+    def _send_cdp(self, method: str, params: Dict) -> Dict:
+        if self.cdp:
+            return self.cdp.conn.send(method, params)
+        return self.driver.execute_cdp_cmd(method, params)
+
+    def _capture_step(self, event: TraceEvent):
+        try:
+            refs = self.capture.capture(self._send_cdp)
+        except Exception as e:
+            logger.debug("Step capture failed: %s", e)
+            return
+        event.screenshot = refs["screenshot"]
+        event.dom = refs["dom"]
+
+    def _call_js(self, function_source: str, *args):
+        if self.cdp:
+            return self.cdp.call(function_source, *args)
+        return self.driver.execute_script(f"return ({function_source}).apply(null, arguments);", *args)
+
+    def _extract_step(self, step: Dict, ts: str, url: Optional[str]) -> TraceEvent:
+        """url: the page open in the current tab, under which the text is filed."""
+        if url is None:
+            # the open before it failed and was already traced; nothing to read
+            return TraceEvent(
+                action="extract", selector="", timestamp=ts,
+                result="skipped", error="no page open",
+            )
+        extractor = extract_page_text(
+            self._call_js,
+            max_bytes=step.get("max_bytes", 256_000),
+            token_budget=step.get("token_budget", 600),
+        )
+        self.page_texts[url] = extractor.excerpt()
+        return TraceEvent(
+            action="extract",
+            selector=url,
+            timestamp=ts,
+            result="success",
+            bytes=extractor.scanned_bytes,
+        )
+
+    def _resolve_url(self, url: str) -> str:
+        if self._replay_server:
+            return self._replay_server.url_for(url)
+        return url
+
+    def _current_url(self) -> str:
+        if self.cdp:
+            return self.cdp.evaluate("location.href") or ""
+        return self.driver.current_url
+
+    def _record_navigation(self, load_ms: float = 0.0):
+        """Record the page a press/click landed on, unless it was just recorded."""
+        try:
+            url = self._current_url()
+            if url.startswith("http") and url != self._last_recorded_url:
+                self._record_page(url, load_ms)
+        except Exception as e:
+            logger.warning("Could not record page after navigation: %s", e)
+
+    def _record_page(self, url: str, load_ms: float):
+        self._last_recorded_url = url
+        if self.cdp:
+            html = self.cdp.evaluate("document.documentElement.outerHTML")
+            resource_urls = self.cdp.evaluate(f"(function() {{{_RESOURCE_URLS_JS}}})()")
+        else:
+            html = self.driver.page_source
+            resource_urls = self.driver.execute_script(_RESOURCE_URLS_JS)
+
+        self.cassette.record_resource(
+            url,
+            (html or "").encode("utf-8"),
+            "text/html; charset=utf-8",
+            latency=load_ms / 1000,
+            kind="page",
+        )
+
+        # The browser doesn't hand us subresource bodies, so fetch them once more
+        for res_url in list(resource_urls or [])[:MAX_RECORDED_RESOURCES]:
+            if self.cassette.resource(res_url):
+                continue
+            started = time.perf_counter()
+            try:
+                resp = requests.get(res_url, timeout=10)
+            except requests.RequestException:
+                continue
+            self.cassette.record_resource(
+                res_url,
+                resp.content,
+                resp.headers.get("Content-Type", ""),
+                status=resp.status_code,
+                latency=time.perf_counter() - started,
+            )
+
+    # ------------------------------------------------------------------
+    # Speculative prefetch (background tabs in the same browser)
+    # ------------------------------------------------------------------
+    def _heap_mb(self) -> float:
+        """JS heap used by the current tab, from its own DevTools target."""
+        try:
+            self.driver.execute_cdp_cmd("Performance.enable", {})
+            metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except Exception:
+            return 0.0
+        used = next((m["value"] for m in metrics if m.get("name") == "JSHeapUsedSize"), 0)
+        return used / 1e6 if isinstance(used, (int, float)) else 0.0
+
+    def _prefetch_heap_mb(self) -> float:
+        """JS heap summed over the prefetched tabs opened so far."""
+        current = self.driver.current_window_handle
+        total = 0.0
+        for handle, _ in self._prefetched:
+            try:
+                self.driver.switch_to.window(handle)
+            except Exception:
+                continue
+            total += self._heap_mb()
+        self.driver.switch_to.window(current)
+        return total
+
+    def _start_prefetch(self, urls: List[str]):
+        primary = self.driver.current_window_handle
+        if self.cassette and self.cassette.replaying:
+            # unrecorded pages would load as the replay server's 404 and get promoted
+            urls = [u for u in urls if self.cassette.resource(u)]
+        for url in urls[: self.max_prefetch_tabs]:
+            if self._prefetched and self._prefetch_heap_mb() > self.prefetch_max_heap_mb:
+                logger.info(
+                    "Skipping prefetch of %s: prefetched tabs' JS heap above %s MB",
+                    url, self.prefetch_max_heap_mb,
+                )
+                break
+            self.driver.switch_to.new_window("tab")
+            # new tabs don't inherit the first tab's Network.setBlockedURLs
+            self._apply_blocklist()
+            # assigning location returns immediately, unlike driver.get
+            self.driver.execute_script("window.location.href = arguments[0];", self._resolve_url(url))
+            self._prefetched.append((self.driver.current_window_handle, url))
+            self.driver.switch_to.window(primary)
+
+    def _cancel_prefetch(self, keep: Optional[str] = None):
+        current = keep or self.driver.current_window_handle
+        for handle, url in self._prefetched:
+            if handle == keep:
+                continue
+            try:
+                self.driver.switch_to.window(handle)
+                if self.cassette and self.cassette.recording:
+                    # recorded so a replayed run can prefetch (and promote) it too
+                    self._record_page(url, 0.0)
+                self.driver.close()
+            except Exception:
+                pass
+        self._prefetched = []
+        self.driver.switch_to.window(current)
+
+    def _promote_prefetched(self) -> Optional[Tuple[str, Optional[float]]]:
+        """
+        Swap the failed primary tab for the first prefetched tab that loaded.
+        Returns (url, the tab's own load time in ms, if the page reports one).
+        """
+        primary = self.driver.current_window_handle
+        for handle, url in self._prefetched:
+            try:
+                self.driver.switch_to.window(handle)
+                state = self.driver.execute_script("return document.readyState;")
+                if state in ("interactive", "complete") and not self.driver.current_url.startswith(
+                    ("about:", "chrome-error:")
+                ):
+                    load_ms = self.driver.execute_script(_NAVIGATION_MS_JS)
+                    self.driver.switch_to.window(primary)
+                    self.driver.close()
+                    self._cancel_prefetch(keep=handle)
+                    return url, round(load_ms, 1) if isinstance(load_ms, (int, float)) and load_ms > 0 else None
+            except Exception:
+                continue
+        self.driver.switch_to.window(primary)
+        return None
+
+    # ------------------------------------------------------------------
+    # Tab groups: several step lists driven round-robin in one session
+    # ------------------------------------------------------------------
+    def _run_tab_group(self, step: Dict, deadline: Deadline) -> List[TraceEvent]:
+        """
+        Run ``step["tabs"]`` (a list of step lists) concurrently, one browser
+        tab per list. "open" steps navigate without blocking; while a tab's
+        page loads, the other tabs make progress. Events are tagged with
+        their tab index and merged in completion order.
+        """
+        if self.backend != "selenium":
+            raise RuntimeError("tab_group steps require the selenium backend")
+
+        open_timeout = step.get("timeout", 30)
+        primary = self.driver.current_window_handle
+        lanes = []
+        for i, tab_steps in enumerate(step.get("tabs", [])):
+            self.driver.switch_to.new_window("tab")
+            self._apply_blocklist()
+            lanes.append({
+                "tab": i,
+                "handle": self.driver.current_window_handle,
+                "steps": deque(tab_steps),
+                "pending": None,  # (sub-step, timestamp, started) of an in-flight open
+                "current": None,  # (sub-step, timestamp) being worked on this turn
+                "opened": None,  # URL of the page this tab last loaded successfully
+                "ready_at": 0.0,
+            })
+
+        events: List[TraceEvent] = []
+        try:
+            while any(lane["steps"] or lane["pending"] for lane in lanes):
+                if deadline.expired():
+                    for lane in lanes:
+                        pending = [lane["pending"][0]] if lane["pending"] else []
+                        for ev in self._skipped(pending + list(lane["steps"])):
+                            ev.tab = lane["tab"]
+                            events.append(ev)
+                        lane["steps"].clear()
+                        lane["pending"] = None
+                    break
+
+                progressed = False
+                for lane in lanes:
+                    if time.monotonic() < lane["ready_at"]:
+                        continue
+                    lane["current"] = None
+                    try:
+                        advanced, event = self._advance_lane(lane, open_timeout, deadline)
+                    except Exception as e:
+                        # e.g. "document unloaded while waiting for result" mid-navigation;
+                        # fail this lane's step, keep the other tabs going
+                        if lane["current"] is None and lane["pending"]:
+                            lane["current"] = lane["pending"][:2]
+                        elif lane["current"] is None and lane["steps"]:
+                            lane["current"] = (lane["steps"].popleft(), timestamp_iso())
+                        lane["pending"] = None
+                        if lane["current"] is None:
+                            continue
+                        sub, ts = lane["current"]
+                        advanced, event = True, TraceEvent(
+                            action=sub.get("action"),
+                            selector=sub.get("url", sub.get("selector", "")),
+                            timestamp=ts, result="failure", error=str(e),
+                        )
+                    progressed = progressed or advanced
+                    if event is not None:
+                        event.tab = lane["tab"]
+                        events.append(event)
+                        lane["ready_at"] = time.monotonic() + lane["current"][0].get("sleep", 0)
+
+                if not progressed:
+                    time.sleep(0.05)
+        finally:
+            for lane in lanes:
+                try:
+                    self.driver.switch_to.window(lane["handle"])
+                    self.driver.close()
+                except Exception:
+                    pass
+            self.driver.switch_to.window(primary)
+
+        return events
+
+    def _advance_lane(
+        self, lane: Dict, open_timeout: float, deadline: Deadline
+    ) -> Tuple[bool, Optional[TraceEvent]]:
+        """
+        One scheduling turn for a tab-group lane: poll its in-flight open or
+        start its next step. Returns (made progress, finished event or None);
+        the step being worked on is kept in ``lane["current"]``.
+        """
+        self.driver.switch_to.window(lane["handle"])
+
+        if lane["pending"]:
+            sub, ts, started = lane["pending"]
+            lane["current"] = (sub, ts)
+            lane["opened"] = None
+            elapsed = time.perf_counter() - started
+            if not self.driver.execute_script(_NAVIGATION_DONE_JS):
+                if elapsed < open_timeout:
+                    return False, None
+                event = TraceEvent(
+                    action="open", selector=sub["url"], timestamp=ts,
+                    result="failure", error=f"page load exceeded {open_timeout}s",
+                )
+            else:
+                event = TraceEvent(
+                    action="open", selector=sub["url"], timestamp=ts, result="success",
+                    load_ms=round(elapsed * 1000, 1), bytes=self._page_bytes(),
+                )
+                lane["opened"] = sub["url"]
+                if self.cassette and self.cassette.recording:
+                    self._record_page(sub["url"], event.load_ms)
+            lane["pending"] = None
+            return True, event
+
+        if not lane["steps"]:
+            return False, None
+        sub = lane["steps"].popleft()
+        ts = timestamp_iso()
+        lane["current"] = (sub, ts)
+
+        if sub.get("action") == "open":
+            self.driver.execute_script(_NAVIGATE_JS, self._resolve_url(sub["url"]))
+            lane["pending"] = (sub, ts, time.perf_counter())
+            return True, None
+        if sub.get("action") == "extract":
+            # the bot-wide last opened URL belongs to the primary tab
+            return True, self._extract_step(sub, ts, lane["opened"])
+
+        return True, self._run_selenium_step(sub, ts, deadline)
+
+    def _apply_blocklist(self):
+        # Also applies when attached to a user's Chrome, where launch flags can't be set
+        patterns = self.profile.blocked_url_patterns()
+        if not patterns:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            logger.warning("Could not apply CDP URL blocklist: %s", e)
+
+    def _target_id(self) -> Optional[str]:
+        handle = self.driver.current_window_handle
+        if handle not in self._target_ids:
+            try:
+                info = self.driver.execute_cdp_cmd("Target.getTargetInfo", {})
+                self._target_ids[handle] = info["targetInfo"]["targetId"]
+            except Exception:
+                return None
+        return self._target_ids[handle]
+
+    def _page_bytes(self) -> Optional[int]:
+        """
+        Bytes the current tab received since its last call, summed from
+        Network.loadingFinished events: the performance log for the selenium
+        backend, the DevTools socket for the cdp backend. None when the
+        browser reports nothing.
+
+        The performance log covers every tab of the session, so entries are
+        tallied per target ("webview") and each tab only collects its own.
+        """
+        if self.cdp:
+            try:
+                return self.cdp.transferred_bytes()
+            except Exception:
+                return None
+        target = self._target_id()
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception:
+            return None
+        if target is None:
+            return None
+        for entry in entries:
+            try:
+                logged = json.loads(entry["message"])
+                message = logged["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get("method") == LOADING_FINISHED:
+                webview = logged.get("webview")
+                self._bytes_by_target[webview] = (
+                    self._bytes_by_target.get(webview, 0)
+                    + int(message["params"].get("encodedDataLength", 0))
+                )
+        return self._bytes_by_target.pop(target, 0)
+
+    def metrics_summary(self, trace: List[TraceEvent]) -> Dict:
+        """Aggregate load time and bytes of the ``open`` steps in ``trace``."""
+        pages = [e for e in trace if e.action == "open" and e.load_ms is not None]
+        loads = sorted(e.load_ms for e in pages)
+        return {
+            "profile": self.profile.name,
+            "pages": len(pages),
+            "load_ms_avg": round(sum(loads) / len(loads), 1) if loads else None,
+            "load_ms_max": loads[-1] if loads else None,
+            "bytes_total": sum(e.bytes or 0 for e in pages),
+        }
+
+    def _selenium_open(self, step: Dict, ts: str, deadline: Deadline) -> List[TraceEvent]:
+        """
+        Load ``step["url"]``, falling back to a prefetched tab if it fails.
+        A promotion yields two events: the primary's failure and the promoted
+        page, timed from that tab's own navigation.
+        """
+        self._last_opened_url = None
+        if deadline.seconds is not None:
+            self.driver.set_page_load_timeout(deadline.timeout(300))
+        if step.get("prefetch"):
+            self._start_prefetch(step["prefetch"])
+        self._page_bytes()  # drop what earlier steps loaded
+        started = time.perf_counter()
+        try:
+            self.driver.get(self._resolve_url(step["url"]))
+        except Exception as e:
+            promoted = self._promote_prefetched() if self._prefetched else None
+            if not promoted:
+                raise
+            url, load_ms = promoted
+            logger.info("Primary %s failed, promoted prefetched tab %s", step["url"], url)
+            if self.cassette and self.cassette.recording:
+                self._record_page(url, load_ms or 0.0)
+            self._last_opened_url = url
+            clipped = deadline.remaining() < DEADLINE_SLACK
+            return [
+                TraceEvent(
+                    action="open",
+                    selector=step["url"],
+                    timestamp=ts,
+                    result="skipped" if clipped else "failure",
+                    error=f"deadline exceeded: {e}" if clipped else str(e),
+                ),
+                TraceEvent(
+                    action="open",
+                    selector=url,
+                    timestamp=ts,
+                    result="success",
+                    error=f"promoted prefetched tab after: {e}",
+                    load_ms=load_ms,
+                    bytes=self._page_bytes(),
+                ),
+            ]
+        load_ms = round((time.perf_counter() - started) * 1000, 1)
+        if self._prefetched:
+            self._cancel_prefetch()
+        self._last_opened_url = step["url"]
+        if self.cassette and self.cassette.recording:
+            self._record_page(step["url"], load_ms)
+        return [TraceEvent(
+            action="open",
+            selector=step["url"],
+            timestamp=ts,
+            result="success",
+            load_ms=load_ms,
+            bytes=self._page_bytes()
+        )]
+
+    def _run_selenium_step(self, step: Dict, ts: str, deadline: Deadline) -> TraceEvent:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+
+        action = step.get("action")
+
+        # TYPE
+        if action == "type":
+            el = self.driver.find_element(By.CSS_SELECTOR, step["selector"])
+            el.clear()
+            el.send_keys(step.get("text", ""))
+            return TraceEvent(
+                action="type",
+                selector=step["selector"],
+                timestamp=ts,
+                result="success"
+            )
+
+        # PRESS
+        elif action == "press":
+            key = step.get("key", "ENTER").upper()
+            body = self.driver.find_element(By.TAG_NAME, "body")
+            body.send_keys(getattr(Keys, key, Keys.ENTER))
+            return TraceEvent(
+                action="press",
+                selector=key,
+                timestamp=ts,
+                result="success"
+            )
+
+        # PAGE TEXT FOR VERIFICATION
+        elif action == "extract":
+            return self._extract_step(step, ts, self._last_opened_url)
+
+        # AGENT-DECIDED CLICK (DuckDuckGo-safe)
+        elif action == "click_dynamic":
+            target_url = step["url"]
+            target_domain = urlparse(target_url).netloc.replace("www.", "")
+
+            links = self.driver.find_elements(By.CSS_SELECTOR, "a[href]")
+
+            for link in links:
+                href = link.get_attribute("href") or ""
+
+                # handle DuckDuckGo redirect pattern with uddg parameter
+                if "uddg=" in href:
+                    try:
+                        parsed = parse_qs(urlparse(href).query)
+                        decoded = unquote(parsed.get("uddg", [""])[0])
+                    except Exception:
+                        decoded = ""
+
+                    if target_domain and target_domain in decoded:
+                        self.driver.execute_script(
+                            "arguments[0].scrollIntoView({block:'center'});",
+                            link
+                        )
+                        time.sleep(0.4)
+                        try:
+                            link.click()
+                        except Exception:
+                            self.driver.execute_script("arguments[0].click();", link)
+
+                        return TraceEvent(
+                            action="click_dynamic",
+                            selector=decoded,
+                            timestamp=ts,
+                            result="success"
+                        )
+
+                # fallback: if link href directly contains domain
+                elif target_domain and target_domain in href:
+                    self.driver.execute_script(
+                        "arguments[0].scrollIntoView({block:'center'});",
+                        link
+                    )
+                    time.sleep(0.4)
+                    try:
+                        link.click()
+                    except Exception:
+                        self.driver.execute_script("arguments[0].click();", link)
+
+                    return TraceEvent(
+                        action="click_dynamic",
+                        selector=href,
+                        timestamp=ts,
+                        result="success"
+                    )
+
+            raise RuntimeError(f"No DuckDuckGo result matched target domain: {target_domain}")
+
+        # UNKNOWN
+        else:
+            return TraceEvent(
+                action=action,
+                selector="",
+                timestamp=ts,
+                result="unknown-action"
+            )
+
+    @staticmethod
+    def _skipped(steps: List[Dict]) -> List[TraceEvent]:
+        ts = timestamp_iso()
+        return [
+            TraceEvent(
+                action=step.get("action"),
+                selector=step.get("url", step.get("selector", "")),
+                timestamp=ts,
+                result="skipped",
+                error="deadline exceeded",
+            )
+            for step in steps
+        ]
 
     # run_steps as before (Keeps click_dynamic / uddg handling)
-    def run_steps(self, steps: List[Dict]) -> List[Dict]:
-        trace: List[Dict] = []
+    def run_steps(
+        self,
+        steps: List[Dict],
+        deadline: Optional[Deadline] = None,
+    ) -> List[TraceEvent]:
+        """
+        deadline: job time budget; page loads and step sleeps are clipped to
+        what is left, and steps that no longer fit are recorded as "skipped".
+        """
+        trace: List[TraceEvent] = []
+        deadline = deadline or Deadline()
+        if deadline.expired():
+            return self._skipped(steps)
 
         try:
-            self._init_driver()
+            if self.cassette and self.cassette.replaying:
+                from webnavigator_ai.replay.server import ReplayServer
+
+                self._replay_server = ReplayServer(self.cassette).start()
+
+            if self.backend == "cdp":
+                self._init_cdp()
+            else:
+                self._init_driver()
+
+            for i, step in enumerate(steps):
+                if deadline.expired():
+                    trace.extend(self._skipped(steps[i:]))
+                    break
 
-            for step in steps:
                 ts = timestamp_iso()
                 action = step.get("action")
 
                 try:
-                    # OPEN
-                    if action == "open":
-                        self.driver.get(step["url"])
-                        trace.append({
-                            "action": "open",
-                            "selector": step["url"],
-                            "timestamp": ts,
-                            "result": "success"
-                        })
-
-                    # TYPE
-                    elif action == "type":
-                        el = self.driver.find_element(By.CSS_SELECTOR, step["selector"])
-                        el.clear()
-                        el.send_keys(step.get("text", ""))
-                        trace.append({
-                            "action": "type",
-                            "selector": step["selector"],
-                            "timestamp": ts,
-                            "result": "success"
-                        })
-
-                    # PRESS
-                    elif action == "press":
-                        key = step.get("key", "ENTER").upper()
-                        body = self.driver.find_element(By.TAG_NAME, "body")
-                        body.send_keys(getattr(Keys, key, Keys.ENTER))
-                        trace.append({
-                            "action": "press",
-                            "selector": key,
-                            "timestamp": ts,
-                            "result": "success"
-                        })
-
-                    # AGENT-DECIDED CLICK (DuckDuckGo-safe)
-                    elif action == "click_dynamic":
-                        target_url = step["url"]
-                        target_domain = urlparse(target_url).netloc.replace("www.", "")
-
-                        links = self.driver.find_elements(By.CSS_SELECTOR, "a[href]")
-                        clicked = False
-
-                        for link in links:
-                            href = link.get_attribute("href") or ""
-
-                            # handle DuckDuckGo redirect pattern with uddg parameter
-                            if "uddg=" in href:
-                                try:
-                                    parsed = parse_qs(urlparse(href).query)
-                                    decoded = unquote(parsed.get("uddg", [""])[0])
-                                except Exception:
-                                    decoded = ""
-
-                                if target_domain and target_domain in decoded:
-                                    self.driver.execute_script(
-                                        "arguments[0].scrollIntoView({block:'center'});",
-                                        link
-                                    )
-                                    time.sleep(0.4)
-                                    try:
-                                        link.click()
-                                    except Exception:
-                                        self.driver.execute_script("arguments[0].click();", link)
-
-                                    trace.append({
-                                        "action": "click_dynamic",
-                                        "selector": decoded,
-                                        "timestamp": ts,
-                                        "result": "success"
-                                    })
-                                    clicked = True
-                                    break
-
-                            # fallback: if link href directly contains domain
-                            elif target_domain and target_domain in href:
-                                self.driver.execute_script(
-                                    "arguments[0].scrollIntoView({block:'center'});",
-                                    link
-                                )
-                                time.sleep(0.4)
-                                try:
-                                    link.click()
-                                except Exception:
-                                    self.driver.execute_script("arguments[0].click();", link)
-
-                                trace.append({
-                                    "action": "click_dynamic",
-                                    "selector": href,
-                                    "timestamp": ts,
-                                    "result": "success"
-                                })
-                                clicked = True
-                                break
-
-                        if not clicked:
-                            raise RuntimeError(f"No DuckDuckGo result matched target domain: {target_domain}")
-
-                    # UNKNOWN
+                    if action == "tab_group":
+                        trace.extend(self._run_tab_group(step, deadline))
+                    elif self.backend == "cdp":
+                        trace.append(self._run_cdp_step(step, ts, deadline))
+                    elif action == "open":
+                        trace.extend(self._selenium_open(step, ts, deadline))
                     else:
-                        trace.append({
-                            "action": action,
-                            "selector": "",
-                            "timestamp": ts,
-                            "result": "unknown-action"
-                        })
+                        trace.append(self._run_selenium_step(step, ts, deadline))
 
-                    time.sleep(step.get("sleep", 0.8))
+                    deadline.sleep(step.get("sleep", 0.8))
+                    if action == "open" and trace[-1].bytes is not None:
+                        # eager loads return at DOMContentLoaded; count what
+                        # finished arriving while the page settled
+                        trace[-1].bytes += self._page_bytes() or 0
+                    if (
+                        self.cassette and self.cassette.recording
+                        and action in NAVIGATING_ACTIONS
+                    ):
+                        self._record_navigation()
 
                 except Exception as e:
-                    logger.exception("Selenium step failed")
-                    trace.append({
-                        "action": action,
-                        "selector": step.get("url", step.get("selector", "")),
-                        "timestamp": ts,
-                        "result": "failure",
-                        "error": str(e)
-                    })
+                    # one traceback per action and interval; the trace keeps every error
+                    log_sampled(
+                        logger, logging.ERROR, f"step-failed:{action}",
+                        "Selenium step %s failed: %s", action, e, exc_info=True,
+                    )
+                    # a step cut short by the job's own budget says nothing about the site
+                    clipped = deadline.remaining() < DEADLINE_SLACK
+                    trace.append(TraceEvent(
+                        action=action,
+                        selector=step.get("url", step.get("selector", "")),
+                        timestamp=ts,
+                        result="skipped" if clipped else "failure",
+                        error=f"deadline exceeded: {e}" if clipped else str(e)
+                    ))
+
+                if self.capture and action != "tab_group":
+                    self._capture_step(trace[-1])
 
             return trace
 
         finally:
+            self._prefetched = []
+            self._bytes_by_target.clear()
+            self._target_ids.clear()
+            if self.capture:
+                self.capture.close()
+            if self._replay_server:
+                self._replay_server.stop()
+                self._replay_server = None
+            if self.cdp:
+                self.cdp.close()
+                self.cdp = None
             # only quit chromedriver if we launched Chrome; when attaching to user's Chrome,
             # quitting the driver won't close the browser but will stop chromedriver session.
             if self.driver:
@@ -0,0 +1,140 @@
+# webnavigator_ai/selenium_bot/capture.py
+import base64
+import gzip
+import hashlib
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+from webnavigator_ai.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+_STOP = object()
+
+
+def _digest(data: str) -> str:
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class StepCapture:
+    """
+    Per-step screenshot and DOM snapshots, written off the hot path.
+
+    ``capture(send)`` only runs the two DevTools commands and hashes what
+    they return; decoding, gzip and disk writes happen on a background
+    thread fed by a bounded queue. When the writer falls behind, new frames
+    are dropped (and not referenced from the trace) instead of stalling the
+    browser. Files are named by content digest, so an unchanged page is
+    referenced again without being queued or written twice.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        screenshots: bool = True,
+        dom: bool = True,
+        jpeg_quality: int = 60,
+        max_queue: int = 16,
+    ):
+        self.directory = Path(directory)
+        self.screenshots = screenshots
+        self.dom = dom
+        self.jpeg_quality = jpeg_quality
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._known: Set[str] = set()
+        self.captured = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.written = 0
+
+    # ------------------------------------------------------------------
+    # Hot path
+    # ------------------------------------------------------------------
+    def capture(self, send: Callable[[str, Dict], Dict]) -> Dict[str, Optional[str]]:
+        """
+        send(method, params) runs one DevTools command in the current tab.
+        Returns {"screenshot": filename|None, "dom": filename|None}.
+        """
+        refs: Dict[str, Optional[str]] = {"screenshot": None, "dom": None}
+        if self.screenshots:
+            shot = send(
+                "Page.captureScreenshot",
+                {"format": "jpeg", "quality": self.jpeg_quality, "optimizeForSpeed": True},
+            )
+            refs["screenshot"] = self._submit(shot.get("data"), ".jpg")
+        if self.dom:
+            snapshot = send(
+                "Runtime.evaluate",
+                {"expression": "document.documentElement.outerHTML", "returnByValue": True},
+            )
+            refs["dom"] = self._submit(snapshot.get("result", {}).get("value"), ".html.gz")
+        return refs
+
+    def _submit(self, payload: Optional[str], suffix: str) -> Optional[str]:
+        if not payload:
+            return None
+        name = _digest(payload) + suffix
+        if name in self._known:
+            self.deduplicated += 1
+            return name
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((name, payload))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        self._known.add(name)
+        self.captured += 1
+        return name
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _ensure_writer(self):
+        if self._thread is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._drain, name="step-capture", daemon=True)
+            self._thread.start()
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            name, payload = item
+            try:
+                self._write(name, payload)
+            except Exception as e:
+                logger.warning("Could not write capture %s: %s", name, e)
+
+    def _write(self, name: str, payload: str):
+        path = self.directory / name
+        if path.exists():
+            return
+        if name.endswith(".jpg"):
+            data = base64.b64decode(payload)
+        else:
+            data = gzip.compress(payload.encode("utf-8"), compresslevel=6)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        self.written += 1
+
+    def close(self):
+        """Flush queued captures and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "captured": self.captured,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+            "written": self.written,
+        }
@@ -0,0 +1,344 @@
+# webnavigator_ai/selenium_bot/cdp.py
+import json
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from webnavigator_ai.selenium_bot.profiles import BrowserProfile, get_profile
+from webnavigator_ai.utils.lazy import lazy_import
+from webnavigator_ai.utils.logging import setup_logger
+
+requests = lazy_import("requests")
+websocket = lazy_import("websocket")
+logger = setup_logger(__name__)
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+# Input.dispatchKeyEvent payloads for the keys ``press`` steps use
+KEY_DEFINITIONS = {
+    "ENTER": {"key": "Enter", "code": "Enter", "windowsVirtualKeyCode": 13, "text": "\r"},
+    "RETURN": {"key": "Enter", "code": "Enter", "windowsVirtualKeyCode": 13, "text": "\r"},
+    "TAB": {"key": "Tab", "code": "Tab", "windowsVirtualKeyCode": 9},
+    "ESCAPE": {"key": "Escape", "code": "Escape", "windowsVirtualKeyCode": 27},
+    "BACKSPACE": {"key": "Backspace", "code": "Backspace", "windowsVirtualKeyCode": 8},
+    "SPACE": {"key": " ", "code": "Space", "windowsVirtualKeyCode": 32, "text": " "},
+    "ARROW_DOWN": {"key": "ArrowDown", "code": "ArrowDown", "windowsVirtualKeyCode": 40},
+    "ARROW_UP": {"key": "ArrowUp", "code": "ArrowUp", "windowsVirtualKeyCode": 38},
+    "PAGE_DOWN": {"key": "PageDown", "code": "PageDown", "windowsVirtualKeyCode": 34},
+}
+
+# Same matching rules as SeleniumBot's click_dynamic: DuckDuckGo ``uddg``
+# redirects are decoded first, otherwise the raw href must contain the domain.
+_CLICK_DYNAMIC_JS = """
+(function(domain) {
+  for (const link of document.querySelectorAll('a[href]')) {
+    const href = link.href || '';
+    let target = null;
+    if (href.includes('uddg=')) {
+      try {
+        const decoded = decodeURIComponent(new URL(href).searchParams.get('uddg') || '');
+        if (domain && decoded.includes(domain)) target = decoded;
+      } catch (e) {}
+    } else if (domain && href.includes(domain)) {
+      target = href;
+    }
+    if (target !== null) {
+      link.scrollIntoView({block: 'center'});
+      link.click();
+      return target;
+    }
+  }
+  return null;
+})
+"""
+
+_FOCUS_AND_CLEAR_JS = """
+(function(selector) {
+  const el = document.querySelector(selector);
+  if (!el) return false;
+  el.focus();
+  if ('value' in el) el.value = '';
+  return true;
+})
+"""
+
+
+# How often type/click_dynamic re-query a page that has not rendered yet
+POLL_INTERVAL = 0.1
+# How long after a key press a navigation must start to be waited for
+NAVIGATION_START_GRACE = 0.5
+
+
+class CDPError(RuntimeError):
+    pass
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class CDPConnection:
+    """Minimal synchronous JSON-RPC client for one DevTools websocket."""
+
+    def __init__(self, ws_url: str, timeout: float = 30):
+        self.timeout = timeout
+        self.ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self._next_id = 0
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        # summed here rather than queued: a heavy page would flood the deque
+        self.bytes_received = 0
+
+    def _queue_event(self, msg: Dict[str, Any]):
+        if msg["method"] == "Network.loadingFinished":
+            self.bytes_received += int(msg.get("params", {}).get("encodedDataLength", 0))
+        else:
+            self._events.append(msg)
+
+    def send(self, method: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        self._next_id += 1
+        msg_id = self._next_id
+        self.ws.settimeout(self.timeout)
+        self.ws.send(json.dumps({"id": msg_id, "method": method, "params": params or {}}))
+        while True:
+            msg = json.loads(self.ws.recv())
+            if msg.get("id") == msg_id:
+                if "error" in msg:
+                    raise CDPError(f"{method}: {msg['error'].get('message')}")
+                return msg.get("result", {})
+            if "method" in msg:
+                self._queue_event(msg)
+
+    def clear_events(self, method: str):
+        self._events = deque(
+            (e for e in self._events if e["method"] != method), maxlen=1000
+        )
+
+    def wait_event(self, method: str, timeout: float) -> Dict[str, Any]:
+        for i, event in enumerate(self._events):
+            if event["method"] == method:
+                del self._events[i]
+                return event
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Timed out waiting for {method}")
+            self.ws.settimeout(remaining)
+            try:
+                msg = json.loads(self.ws.recv())
+            except websocket.WebSocketTimeoutException:
+                raise TimeoutError(f"Timed out waiting for {method}") from None
+            if msg.get("method") == method:
+                return msg
+            if "method" in msg:
+                self._queue_event(msg)
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+class CDPDriver:
+    """
+    Drives one Chrome tab directly over the DevTools protocol, skipping the
+    chromedriver HTTP hop. Attaches to ``debugger_address`` when given,
+    otherwise launches a private Chrome with ``--remote-debugging-port``.
+    """
+
+    def __init__(
+        self,
+        debugger_address: Optional[str] = None,
+        headless: bool = True,
+        chrome_user_data_dir: Optional[str] = None,
+        profile="full",
+        chrome_binary: Optional[str] = None,
+        command_timeout: float = 30,
+    ):
+        self.debugger_address = debugger_address
+        self.headless = headless
+        self.chrome_user_data_dir = chrome_user_data_dir
+        self.profile: BrowserProfile = get_profile(profile)
+        self.chrome_binary = chrome_binary
+        self.command_timeout = command_timeout
+        self.conn: Optional[CDPConnection] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._tmp_profile: Optional[tempfile.TemporaryDirectory] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        if not self.debugger_address:
+            self.debugger_address = self._launch_chrome()
+        self.conn = CDPConnection(self._page_ws_url(), timeout=self.command_timeout)
+        self.conn.send("Page.enable")
+        self.conn.send("Runtime.enable")
+        # Network events also feed transferred_bytes()
+        self.conn.send("Network.enable")
+        patterns = self.profile.blocked_url_patterns()
+        if patterns:
+            self.conn.send("Network.setBlockedURLs", {"urls": patterns})
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+        # only stop Chrome if we launched it; attached browsers stay open
+        if self._process:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._tmp_profile:
+            self._tmp_profile.cleanup()
+            self._tmp_profile = None
+
+    def _launch_chrome(self) -> str:
+        binary = self.chrome_binary or next(
+            (b for b in map(shutil.which, CHROME_BINARIES) if b), None
+        )
+        if not binary:
+            raise RuntimeError("Could not find a Chrome binary for the CDP backend")
+
+        user_data_dir = self.chrome_user_data_dir
+        if not user_data_dir:
+            self._tmp_profile = tempfile.TemporaryDirectory(prefix="webnavigator-cdp-")
+            user_data_dir = self._tmp_profile.name
+
+        port = _free_port()
+        args = [
+            binary,
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={user_data_dir}",
+            "--disable-gpu",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            *self.profile.chrome_arguments(),
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        if self.profile.disable_images:
+            args.append("--blink-settings=imagesEnabled=false")
+        args.append("about:blank")
+
+        logger.info("Launching Chrome for CDP backend on port %s", port)
+        self._process = subprocess.Popen(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+        address = f"127.0.0.1:{port}"
+        deadline = time.monotonic() + 15
+        while time.monotonic() < deadline:
+            try:
+                requests.get(f"http://{address}/json/version", timeout=1).raise_for_status()
+                return address
+            except requests.RequestException:
+                time.sleep(0.1)
+        raise RuntimeError("Chrome did not expose its DevTools endpoint in time")
+
+    def _page_ws_url(self) -> str:
+        base = f"http://{self.debugger_address}"
+        targets: List[Dict] = requests.get(f"{base}/json/list", timeout=5).json()
+        for target in targets:
+            if target.get("type") == "page" and target.get("webSocketDebuggerUrl"):
+                return target["webSocketDebuggerUrl"]
+        target = requests.put(f"{base}/json/new?about:blank", timeout=5).json()
+        return target["webSocketDebuggerUrl"]
+
+    # ------------------------------------------------------------------
+    # Primitives
+    # ------------------------------------------------------------------
+    def evaluate(self, expression: str) -> Any:
+        result = self.conn.send(
+            "Runtime.evaluate",
+            {"expression": expression, "returnByValue": True, "awaitPromise": True},
+        )
+        if "exceptionDetails" in result:
+            raise CDPError(result["exceptionDetails"].get("text", "Runtime.evaluate failed"))
+        return result.get("result", {}).get("value")
+
+    def transferred_bytes(self) -> int:
+        """Bytes received over the network since the last call."""
+        # any round trip reads the events queued on the socket before its reply
+        self.conn.send("Runtime.evaluate", {"expression": "0"})
+        received, self.conn.bytes_received = self.conn.bytes_received, 0
+        return received
+
+    def call(self, function_source: str, *args: Any) -> Any:
+        """Call a JS function expression with JSON-serializable ``args``."""
+        return self.evaluate(f"({function_source})({', '.join(json.dumps(a) for a in args)})")
+
+    # ------------------------------------------------------------------
+    # Step actions (same semantics as SeleniumBot's selenium backend)
+    # ------------------------------------------------------------------
+    def _load_event(self) -> Optional[str]:
+        return {
+            "normal": "Page.loadEventFired",
+            "eager": "Page.domContentEventFired",
+        }.get(self.profile.page_load_strategy)
+
+    def _poll(self, query: Callable[[], Any], timeout: float) -> Any:
+        """
+        Re-run ``query`` until it returns something truthy or ``timeout``
+        passes, like chromedriver's implicit wait. Errors from a page that is
+        still navigating count as "not yet".
+        """
+        end = time.monotonic() + timeout
+        while True:
+            try:
+                result = query()
+            except CDPError:
+                result = None
+            if result or time.monotonic() >= end:
+                return result
+            time.sleep(POLL_INTERVAL)
+
+    def open(self, url: str, timeout: float = 30):
+        event = self._load_event()
+        if event:
+            self.conn.clear_events(event)
+        result = self.conn.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+        if event:
+            self.conn.wait_event(event, timeout)
+
+    def type(self, selector: str, text: str, timeout: float = 0):
+        if not self._poll(lambda: self.call(_FOCUS_AND_CLEAR_JS, selector), timeout):
+            raise CDPError(f"No element matches selector: {selector}")
+        self.conn.send("Input.insertText", {"text": text})
+
+    def press(self, key: str, timeout: float = 0):
+        """Dispatch ``key``; if that starts a navigation, wait up to ``timeout`` for it to load."""
+        event = self._load_event()
+        self.conn.clear_events("Page.frameStartedLoading")
+        if event:
+            self.conn.clear_events(event)
+        definition = KEY_DEFINITIONS.get(key.upper(), KEY_DEFINITIONS["ENTER"])
+        self.conn.send("Input.dispatchKeyEvent", {"type": "keyDown", **definition})
+        up = {k: v for k, v in definition.items() if k != "text"}
+        self.conn.send("Input.dispatchKeyEvent", {"type": "keyUp", **up})
+        if timeout <= 0 or not event:
+            return
+        try:
+            self.conn.wait_event("Page.frameStartedLoading", min(NAVIGATION_START_GRACE, timeout))
+        except TimeoutError:
+            return  # handled within the page
+        try:
+            self.conn.wait_event(event, timeout)
+        except TimeoutError:
+            # the next step polls for what it needs, as on the selenium backend
+            logger.debug("Page did not finish loading within %ss after pressing %s", timeout, key)
+
+    def click_dynamic(self, target_domain: str, timeout: float = 0) -> Optional[str]:
+        return self._poll(lambda: self.call(_CLICK_DYNAMIC_JS, target_domain), timeout)
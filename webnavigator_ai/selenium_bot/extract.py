@@ -0,0 +1,146 @@
+# webnavigator_ai/selenium_bot/extract.py
+import hashlib
+import re
+from typing import Callable, List, Optional
+
+# Walks the DOM in document order, one chunk of block texts per call, so the
+# page is never serialized in one piece. Boilerplate subtrees are skipped
+# without being visited. Only leaf-most blocks emit text: a block holding
+# other blocks (``<li><p>..</p></li>``, a layout ``<td>``) is walked through,
+# so nothing is emitted twice and no textContent spans the whole page. State
+# lives on ``window`` between calls.
+EXTRACT_INIT_JS = """
+(function() {
+  const SKIP_TAGS = new Set(['NAV', 'HEADER', 'FOOTER', 'ASIDE', 'SCRIPT', 'STYLE',
+                             'NOSCRIPT', 'FORM', 'SVG', 'IFRAME', 'TEMPLATE', 'BUTTON']);
+  const SKIP_ROLES = new Set(['navigation', 'banner', 'contentinfo', 'complementary', 'dialog']);
+  const SKIP_HINT = /(^|[-_ ])(cookie|consent|banner|sidebar|footer|nav|menu|advert|ads?|promo|share|social|subscribe|newsletter|related|breadcrumb)([-_ ]|$)/i;
+  const BLOCK_TAGS = new Set(['P', 'H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'LI', 'PRE',
+                              'BLOCKQUOTE', 'TD', 'DD', 'DT', 'FIGCAPTION', 'SUMMARY']);
+  const BLOCK_SELECTOR = Array.from(BLOCK_TAGS).join(',');
+  const root = document.querySelector('main, article, [role=main]') || document.body;
+  window.__webnavExtract = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT, {
+    acceptNode(el) {
+      if (SKIP_TAGS.has(el.tagName) || SKIP_ROLES.has(el.getAttribute('role')) ||
+          el.hidden || el.getAttribute('aria-hidden') === 'true' ||
+          SKIP_HINT.test((el.id || '') + ' ' + (typeof el.className === 'string' ? el.className : ''))) {
+        return NodeFilter.FILTER_REJECT;
+      }
+      if (!BLOCK_TAGS.has(el.tagName) || el.querySelector(BLOCK_SELECTOR)) {
+        return NodeFilter.FILTER_SKIP;
+      }
+      return NodeFilter.FILTER_ACCEPT;
+    }
+  });
+  return true;
+})
+"""
+
+EXTRACT_NEXT_JS = """
+(function(maxChars) {
+  const walker = window.__webnavExtract;
+  if (!walker) return {blocks: [], done: true};
+  const blocks = [];
+  let used = 0;
+  let node;
+  while (used < maxChars && (node = walker.nextNode())) {
+    const text = (node.textContent || '').replace(/\\s+/g, ' ').trim();
+    if (!text) continue;
+    blocks.push(text.slice(0, maxChars));
+    used += Math.min(text.length, maxChars);
+  }
+  const done = !node;
+  if (done) delete window.__webnavExtract;
+  return {blocks: blocks, done: done};
+})
+"""
+
+EXTRACT_CLEANUP_JS = "(function() { delete window.__webnavExtract; return true; })"
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Rough characters-per-token for budgeting prompt excerpts
+CHARS_PER_TOKEN = 4
+
+
+class ContentExtractor:
+    """
+    Bounded accumulator for streamed page text.
+
+    Blocks are normalised, short fragments (menus, button labels) dropped,
+    repeats removed by digest, and collection stops once either the scanned
+    input reaches ``max_bytes`` or the excerpt fills ``token_budget``.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256_000,
+        token_budget: int = 600,
+        min_block_chars: int = 40,
+        max_digests: int = 4096,
+    ):
+        self.max_bytes = max_bytes
+        self.max_chars = token_budget * CHARS_PER_TOKEN
+        self.min_block_chars = min_block_chars
+        self.max_digests = max_digests
+        self.scanned_bytes = 0
+        self.duplicates = 0
+        self._parts: List[str] = []
+        self._chars = 0
+        self._digests = set()
+
+    @property
+    def full(self) -> bool:
+        return self.scanned_bytes >= self.max_bytes or self._chars >= self.max_chars
+
+    def feed(self, block: str) -> bool:
+        """Add one block; returns False once no more input is wanted."""
+        if self.full:
+            return False
+        self.scanned_bytes += len(block.encode("utf-8"))
+        text = _WHITESPACE.sub(" ", block).strip()
+        if len(text) < self.min_block_chars:
+            return not self.full
+
+        digest = hashlib.blake2b(text.lower().encode("utf-8"), digest_size=8).digest()
+        if digest in self._digests:
+            self.duplicates += 1
+            return not self.full
+        if len(self._digests) < self.max_digests:
+            self._digests.add(digest)
+
+        room = self.max_chars - self._chars
+        if len(text) > room:
+            text = text[:room].rsplit(" ", 1)[0] + " …"
+        self._parts.append(text)
+        self._chars += len(text) + 1
+        return not self.full
+
+    def excerpt(self) -> str:
+        return "\n".join(self._parts)
+
+
+def extract_page_text(
+    call_js: Callable,
+    max_bytes: int = 256_000,
+    token_budget: int = 600,
+    chunk_chars: int = 16_000,
+) -> ContentExtractor:
+    """
+    Stream the current page's text through a ContentExtractor.
+
+    call_js(function_source, *args) must call the given JS function
+    expression in the page and return its result.
+    """
+    extractor = ContentExtractor(max_bytes=max_bytes, token_budget=token_budget)
+    call_js(EXTRACT_INIT_JS)
+    done = False
+    while not done and not extractor.full:
+        chunk: Optional[dict] = call_js(EXTRACT_NEXT_JS, chunk_chars) or {}
+        done = chunk.get("done", True)
+        for block in chunk.get("blocks", []):
+            if not extractor.feed(block):
+                break
+    if not done:
+        call_js(EXTRACT_CLEANUP_JS)
+    return extractor
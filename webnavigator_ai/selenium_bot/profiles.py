@@ -0,0 +1,105 @@
+# webnavigator_ai/selenium_bot/profiles.py
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# URL patterns for Network.setBlockedURLs, grouped by resource type
+RESOURCE_TYPE_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "image": ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"),
+    "font": ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"),
+    "media": ("*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg", "*.m3u8"),
+}
+
+ANALYTICS_AND_AD_DOMAINS: Tuple[str, ...] = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "scorecardresearch.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """
+    Page-load performance settings applied by ``SeleniumBot._init_driver``.
+
+    page_load_strategy: ``normal`` waits for the ``load`` event, ``eager``
+    returns at DOMContentLoaded, ``none`` returns as soon as navigation starts.
+
+    disk_cache_dir: opt-in HTTP cache kept across runs, e.g.
+    ``dataclasses.replace(get_profile("fast"), disk_cache_dir=...)``. Chrome
+    instances must not share one concurrently, so give each browser (worker
+    process, batch slot) its own directory.
+    """
+
+    name: str
+    page_load_strategy: str = "normal"
+    blocked_resource_types: Tuple[str, ...] = ()
+    blocked_domains: Tuple[str, ...] = ()
+    disable_images: bool = False
+    disable_extensions: bool = False
+    disable_background_networking: bool = False
+    disk_cache_dir: Optional[str] = None
+
+    def blocked_url_patterns(self) -> List[str]:
+        patterns: List[str] = []
+        for rtype in self.blocked_resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[rtype])
+        patterns.extend(f"*{domain}*" for domain in self.blocked_domains)
+        return patterns
+
+    def chrome_arguments(self) -> List[str]:
+        args = []
+        if self.disable_extensions:
+            args.append("--disable-extensions")
+        if self.disable_background_networking:
+            args.extend([
+                "--disable-background-networking",
+                "--disable-component-update",
+                "--disable-sync",
+                "--metrics-recording-only",
+                "--no-first-run",
+            ])
+        if self.disk_cache_dir:
+            args.append(f"--disk-cache-dir={self.disk_cache_dir}")
+        return args
+
+
+PROFILES: Dict[str, BrowserProfile] = {
+    # Everything loads; identical to the historical SeleniumBot behaviour.
+    "full": BrowserProfile(name="full"),
+    "balanced": BrowserProfile(
+        name="balanced",
+        page_load_strategy="eager",
+        blocked_resource_types=("font", "media"),
+        blocked_domains=ANALYTICS_AND_AD_DOMAINS,
+        disable_extensions=True,
+        disable_background_networking=True,
+    ),
+    "fast": BrowserProfile(
+        name="fast",
+        page_load_strategy="eager",
+        blocked_resource_types=("image", "font", "media"),
+        blocked_domains=ANALYTICS_AND_AD_DOMAINS,
+        disable_images=True,
+        disable_extensions=True,
+        disable_background_networking=True,
+    ),
+}
+
+
+def get_profile(profile) -> BrowserProfile:
+    if isinstance(profile, BrowserProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown browser profile {profile!r}; expected one of {sorted(PROFILES)}"
+        ) from None
@@ -0,0 +1,105 @@
+# webnavigator_ai/utils/cache.py
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+from webnavigator_ai.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TTLCache:
+    """
+    Small LRU cache with per-entry expiry and hit-rate counters.
+
+    Entries are stored as ``key -> (expires_at, value)`` in insertion order;
+    reads move the entry to the end so the least recently used entry is
+    always evicted first once ``max_entries`` is reached. Safe to share
+    between the threads of a batch run.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            expires_at = time.time() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            now = time.time()
+            stale = [k for k, (exp, _) in self._entries.items() if exp < now]
+            for k in stale:
+                del self._entries[k]
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    # --------------------------------------------------
+    # Persistence (string keys only, JSON values)
+    # --------------------------------------------------
+    def load(self, path: Path):
+        with self._lock:
+            if not path.exists():
+                return
+            try:
+                stored = json.loads(path.read_text())
+            except (OSError, ValueError) as e:
+                # a cache is only an optimisation; start cold rather than fail
+                logger.warning("Ignoring unreadable cache file %s: %s", path, e)
+                return
+            now = time.time()
+            for key, (expires_at, value) in stored.items():
+                if expires_at >= now:
+                    self._entries[key] = (expires_at, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self, path: Path):
+        # Writers run one at a time and swap a complete file in, so readers
+        # (and concurrent savers in other processes) never see a torn write.
+        with self._lock:
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(dict(self._entries)))
+            os.replace(tmp, path)
@@ -0,0 +1,40 @@
+# webnavigator_ai/utils/deadline.py
+import math
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    """
+    Absolute time budget for one job, passed down through every stage.
+
+    Each stage asks for ``timeout(cap)`` instead of using its own hard-coded
+    timeout, so it only ever gets what is left of the job budget. A deadline
+    created with ``seconds=None`` never expires.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self._expires_at = (
+            time.monotonic() + seconds if seconds is not None else math.inf
+        )
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """``cap`` clipped to the remaining budget; raises once it is spent."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Job deadline of {self.seconds}s exceeded")
+        return min(cap, remaining)
+
+    def sleep(self, seconds: float):
+        time.sleep(min(seconds, self.remaining()))
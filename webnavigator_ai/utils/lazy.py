@@ -0,0 +1,40 @@
+# webnavigator_ai/utils/lazy.py
+import importlib
+import sys
+from typing import Any
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Used for heavy third-party dependencies (selenium, requests, tenacity,
+    websocket) so that importing webnavigator_ai stays cheap for callers that
+    never touch the browser or the network. Attributes set on the proxy
+    (e.g. by ``unittest.mock.patch``) shadow the real module's attributes.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = sys.modules.get(name)
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_lazy_name"])
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] else "not loaded"
+        return f"<lazy module {self.__dict__['_lazy_name']!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -0,0 +1,159 @@
+# webnavigator_ai/utils/limiter.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Optional
+
+
+class SlotUnavailable(TimeoutError):
+    pass
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one downstream (search API, browser, Gemini).
+
+    Every completed call reports its latency and outcome. While calls
+    succeed within the latency target the limit grows by ``increase`` per
+    ``limit`` completions (one step per "round trip" of the current window);
+    an error or a call slower than the target multiplies it by ``decrease``.
+    After a decrease, further congestion signals are ignored until the calls
+    that were already in flight have drained, so one overload burst only
+    backs off once.
+
+    latency_target: seconds; by default ``latency_tolerance`` times the
+    fastest latency among the last ``window`` successes, so the limit stops
+    growing once queueing inside the downstream starts to show up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: float = 2,
+        min_limit: float = 1,
+        max_limit: float = 32,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_target: Optional[float] = None,
+        latency_tolerance: float = 2.0,
+        window: int = 50,
+        clock=time.monotonic,
+    ):
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.clock = clock
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._ewma: Optional[float] = None
+        self._recovering = 0  # completions to ignore after a decrease
+        self.completed = 0
+        self.errors = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return max(int(self._limit), 1)
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight < self.limit, timeout=timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, latency: Optional[float], ok: bool = True):
+        """latency=None frees the slot without feeding the AIMD controller."""
+        with self._cond:
+            self._in_flight -= 1
+            if latency is not None:
+                self._observe(latency, ok)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None):
+        """
+        Hold one slot for the block; an exception inside counts as an error.
+        On the yielded outcome, set ``ok = False`` for failures that did not
+        raise, and ``latency`` to report a per-call latency other than the
+        block's wall time (None there means "nothing to measure"). Raises
+        SlotUnavailable if no slot frees up within ``timeout``.
+        """
+        if not self.acquire(timeout):
+            raise SlotUnavailable(f"No {self.name} slot within {timeout}s")
+        outcome = SlotOutcome()
+        started = self.clock()
+        try:
+            yield outcome
+        except BaseException:
+            outcome.ok = False
+            raise
+        finally:
+            latency = self.clock() - started if outcome.latency is _WALL_TIME else outcome.latency
+            self.release(latency, outcome.ok)
+
+    # ------------------------------------------------------------------
+    # AIMD
+    # ------------------------------------------------------------------
+    def target(self) -> Optional[float]:
+        if self.latency_target is not None:
+            return self.latency_target
+        if len(self._latencies) < 5:
+            return None
+        return min(self._latencies) * self.latency_tolerance
+
+    def _observe(self, latency: float, ok: bool):
+        self.completed += 1
+        self._ewma = latency if self._ewma is None else 0.8 * self._ewma + 0.2 * latency
+        target = self.target()
+        congested = not ok or (target is not None and latency > target)
+        if not ok:
+            self.errors += 1
+        else:
+            self._latencies.append(latency)
+
+        if self._recovering:
+            self._recovering -= 1
+            return
+        if congested:
+            self._limit = max(self.min_limit, self._limit * self.decrease)
+            self.decreases += 1
+            self._recovering = self._in_flight
+        else:
+            self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            target = self.target()
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "errors": self.errors,
+                "decreases": self.decreases,
+                "ewma_latency_ms": round(self._ewma * 1000, 1) if self._ewma is not None else None,
+                "latency_target_ms": round(target * 1000, 1) if target is not None else None,
+            }
+
+
+_WALL_TIME = object()
+
+
+class SlotOutcome:
+    __slots__ = ("ok", "latency")
+
+    def __init__(self):
+        self.ok = True
+        self.latency = _WALL_TIME
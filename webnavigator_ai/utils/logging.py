@@ -1,14 +1,188 @@
 # webnavigator_ai/utils/logging.py
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - [%(job_id)s] %(message)s"
+
+# Job the current call stack belongs to; stamped onto every record
+job_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("job_id", default=None)
+
+_queue_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+@contextmanager
+def job_context(job_id: str):
+    """Tag every record logged inside the block with ``job_id``."""
+    token = job_id_var.set(job_id)
+    try:
+        yield job_id
+    finally:
+        job_id_var.reset(token)
+
+
+class TextFormatter(logging.Formatter):
+    """TEXT_FORMAT; records logged outside a job show ``[-]``."""
+
+    def __init__(self, fmt: str = TEXT_FORMAT, **kwargs):
+        super().__init__(fmt, **kwargs)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        if not getattr(record, "job_id", None):
+            record = logging.makeLogRecord({**record.__dict__, "job_id": "-"})
+        return super().formatMessage(record)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        job_id = getattr(record, "job_id", None)
+        if job_id:
+            entry["job_id"] = job_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _JobQueueHandler(logging.handlers.QueueHandler):
+    """Stamps the job id in the calling thread, leaves formatting to the listener."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.job_id = job_id_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # traceback objects pin frames; render them before crossing threads
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(fmt: Optional[str] = None, stream=None, max_queue: int = 10_000):
+    """
+    (Re)build the shared logging pipeline.
+
+    Records go through a bounded in-memory queue to one background writer,
+    so callers never block on stdout. fmt is "text" or "json" (default from
+    ``WEBNAV_LOG_FORMAT``). When the queue is full, records are dropped.
+    """
+    global _queue_handler, _listener
+    fmt = fmt or os.getenv("WEBNAV_LOG_FORMAT", "text")
+    if fmt not in ("text", "json"):
+        raise ValueError(f"Unknown log format {fmt!r}")
+
+    with _setup_lock:
+        if _listener:
+            _listener.stop()
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        log_queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+
+        new_handler = _JobQueueHandler(log_queue)
+        if _queue_handler:
+            # swap the new handler in on every logger already set up
+            for logger in list(logging.root.manager.loggerDict.values()):
+                if isinstance(logger, logging.Logger) and _queue_handler in logger.handlers:
+                    logger.removeHandler(_queue_handler)
+                    logger.addHandler(new_handler)
+        _queue_handler = new_handler
+    return _queue_handler
+
+
+def flush_logging():
+    """Write out everything queued so far (the writer keeps running)."""
+    if _listener:
+        _listener.stop()
+        _listener.start()
+
+
+def _shutdown():
+    if _listener:
+        _listener.stop()
+
+
+atexit.register(_shutdown)
+
 
 def setup_logger(name="webnavigator", level=logging.INFO):
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
-    handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    handler.setFormatter(formatter)
+    handler = _queue_handler or configure_logging()
     logger.addHandler(handler)
     logger.setLevel(level)
     return logger
+
+
+class LogSampler:
+    """
+    Rate limiter for repetitive messages: per key, the first record passes
+    and afterwards at most one per ``interval`` seconds, carrying a count of
+    what was suppressed in between.
+    """
+
+    def __init__(self, interval: float = 10.0, clock=time.monotonic):
+        self.interval = interval
+        self.clock = clock
+        self._last: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> Optional[int]:
+        """Returns the number of suppressed records if this one may pass, else None."""
+        now = self.clock()
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return None
+            self._last[key] = now
+            return self._suppressed.pop(key, 0)
+
+    def log(self, logger: logging.Logger, level: int, key: str, msg: str, *args, **kwargs):
+        if not logger.isEnabledFor(level):
+            return
+        suppressed = self.allow(key)
+        if suppressed is None:
+            return
+        if suppressed:
+            msg = f"{msg} ({suppressed} similar suppressed)"
+        logger.log(level, msg, *args, **kwargs)
+
+
+_default_sampler = LogSampler()
+
+
+def log_sampled(logger: logging.Logger, level: int, key: str, msg: str, *args, **kwargs):
+    """``logger.log`` rate-limited per ``key`` by the shared LogSampler."""
+    _default_sampler.log(logger, level, key, msg, *args, **kwargs)
@@ -1,10 +1,10 @@
 # webnavigator_ai/utils/schema.py
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Optional, Any, Dict
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedSearchResult:
     title: str
     snippet: str
@@ -13,8 +13,64 @@ class NormalizedSearchResult:
     published_at: Optional[str] = None
     raw: Optional[Dict[str, Any]] = None
 
-    def to_dict(self):
-        return asdict(self)
+    def to_dict(self, include_raw: bool = True) -> Dict[str, Any]:
+        # Built by hand rather than with dataclasses.asdict(), which deep-copies
+        # the provider payload in ``raw`` for every result.
+        return {
+            "title": self.title,
+            "snippet": self.snippet,
+            "url": self.url,
+            "source": self.source,
+            "published_at": self.published_at,
+            "raw": self.raw if include_raw else None,
+        }
+
+
+@dataclass(slots=True)
+class TraceEvent:
+    """One executed Selenium step. Supports ``event["key"]`` for callers that
+    still treat trace entries as dicts."""
+
+    action: Optional[str]
+    selector: str
+    timestamp: str
+    result: str
+    error: Optional[str] = None
+    load_ms: Optional[float] = None
+    bytes: Optional[int] = None
+    tab: Optional[int] = None
+    screenshot: Optional[str] = None
+    dom: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {
+            "action": self.action,
+            "selector": self.selector,
+            "timestamp": self.timestamp,
+            "result": self.result,
+        }
+        if self.error is not None:
+            d["error"] = self.error
+        if self.load_ms is not None:
+            d["load_ms"] = self.load_ms
+        if self.bytes is not None:
+            d["bytes"] = self.bytes
+        if self.tab is not None:
+            d["tab"] = self.tab
+        if self.screenshot is not None:
+            d["screenshot"] = self.screenshot
+        if self.dom is not None:
+            d["dom"] = self.dom
+        return d
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
 
 
 def timestamp_iso():
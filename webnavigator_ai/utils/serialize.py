@@ -0,0 +1,43 @@
+# webnavigator_ai/utils/serialize.py
+import json
+from typing import Any, BinaryIO, Iterable
+
+from webnavigator_ai.utils.schema import NormalizedSearchResult
+
+
+def _encoder(include_raw: bool) -> json.JSONEncoder:
+    def default(obj: Any):
+        if isinstance(obj, NormalizedSearchResult):
+            return obj.to_dict(include_raw=include_raw)
+        if hasattr(obj, "to_dict"):
+            return obj.to_dict()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    return json.JSONEncoder(
+        separators=(",", ":"), ensure_ascii=False, default=default
+    )
+
+
+_WITH_RAW = _encoder(include_raw=True)
+_WITHOUT_RAW = _encoder(include_raw=False)
+
+
+def to_json_bytes(obj: Any, include_raw: bool = True) -> bytes:
+    """
+    Serialize results, trace events and plain containers straight to compact
+    UTF-8 JSON. Records are expanded one level at a time by the encoder, so
+    nothing (in particular ``raw``) is deep-copied first.
+    """
+    encoder = _WITH_RAW if include_raw else _WITHOUT_RAW
+    return encoder.encode(obj).encode("utf-8")
+
+
+def write_jsonl(records: Iterable[Any], fh: BinaryIO, include_raw: bool = True) -> int:
+    """Write one JSON document per line to a binary file; returns the count."""
+    encoder = _WITH_RAW if include_raw else _WITHOUT_RAW
+    n = 0
+    for record in records:
+        fh.write(encoder.encode(record).encode("utf-8"))
+        fh.write(b"\n")
+        n += 1
+    return n
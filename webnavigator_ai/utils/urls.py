@@ -0,0 +1,34 @@
+# webnavigator_ai/utils/urls.py
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+_TRACKING_PREFIXES = ("utm_", "fbclid", "gclid", "mc_", "ref_src")
+
+
+def host_of(url: str) -> str:
+    """Lower-cased host without port or a leading ``www.``."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalise a URL so that trivially different spellings of the same page
+    share one cache key: scheme/host are lower-cased, ``www.``, fragments,
+    tracking parameters and trailing slashes are dropped, and the remaining
+    query parameters are sorted.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    netloc = host_of(url)
+    if parts.port:
+        netloc = f"{netloc}:{parts.port}"
+    return urlunsplit(
+        ((parts.scheme or "http").lower(), netloc, path, urlencode(query), "")
+    )
@@ -0,0 +1,78 @@
+# webnavigator_ai/verifier/cache.py
+import atexit
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from webnavigator_ai.utils.cache import TTLCache
+from webnavigator_ai.utils.logging import setup_logger
+from webnavigator_ai.utils.schema import NormalizedSearchResult
+from webnavigator_ai.utils.urls import canonical_url
+
+logger = setup_logger(__name__)
+
+
+class VerdictCache:
+    """
+    Persistent per-URL verdict cache.
+
+    Keys combine the canonical URL with a hash of the result snippet, so a
+    page is re-verified when the search provider starts returning different
+    content for it. Only model verdicts are cached; heuristic verdicts are
+    cheap to recompute and would mask a later Gemini answer.
+
+    New verdicts are written to ``path`` at most every ``save_interval``
+    seconds (``save_if_due``), on ``save()`` and at interpreter exit, so
+    verification calls don't rewrite the whole file each time.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = ".verdict_cache.json",
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        save_interval: float = 60.0,
+    ):
+        self.path = Path(path) if path else None
+        self.save_interval = save_interval
+        self._cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self._dirty = False
+        self._last_save = time.monotonic()
+        if self.path:
+            self._cache.load(self.path)
+            atexit.register(self.save)
+
+    @staticmethod
+    def key(result: NormalizedSearchResult) -> str:
+        digest = hashlib.sha1((result.snippet or "").encode("utf-8")).hexdigest()[:16]
+        return f"{canonical_url(result.url)}#{digest}"
+
+    def get(self, result: NormalizedSearchResult) -> Optional[Dict]:
+        return self._cache.get(self.key(result))
+
+    def put(self, result: NormalizedSearchResult, verdict: Dict):
+        self._cache.put(self.key(result), verdict)
+        self._dirty = True
+
+    def save(self):
+        """Write unsaved verdicts now."""
+        if not self.path or not self._dirty:
+            return
+        self._dirty = False
+        self._last_save = time.monotonic()
+        try:
+            self._cache.save(self.path)
+        except OSError as e:
+            self._dirty = True
+            logger.warning("Could not save verdict cache %s: %s", self.path, e)
+
+    def save_if_due(self):
+        if self._dirty and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def stats(self) -> Dict:
+        return self._cache.stats()
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -1,13 +1,28 @@
 # webnavigator_ai/verifier/gemini_verifier.py
 import os
-import requests
-from typing import List, Dict, Any
+import re
+import threading
+import time
+from typing import List, Dict, Any, Optional
 
 from webnavigator_ai.utils.schema import NormalizedSearchResult
+from webnavigator_ai.utils.lazy import lazy_import
 from webnavigator_ai.utils.logging import setup_logger
+from webnavigator_ai.verifier.cache import VerdictCache
+from webnavigator_ai.verifier.trust_index import BulkVerdicts, DomainTrustIndex
 
+requests = lazy_import("requests")
 logger = setup_logger(__name__)
 
+VERDICT_LABELS = ("likely-true", "likely-false", "uncertain")
+
+# "3 | likely-true | 0.8" -- one line per result, as requested in the prompt
+_VERDICT_LINE = re.compile(
+    r"^\s*(\d+)\s*[|:.)-]\s*(likely-true|likely-false|uncertain)\s*[|:,]\s*([01](?:\.\d+)?)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SUMMARY_LINE = re.compile(r"^\s*SUMMARY\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE | re.DOTALL)
+
 
 class GeminiVerifier:
     """
@@ -15,32 +30,147 @@ class GeminiVerifier:
     Supports Gemini 2.5 Flash via v1beta:generateContent.
     """
 
-    def __init__(self, api_key: str = None, api_url: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        api_url: str = None,
+        cache: Optional[VerdictCache] = None,
+        trust_index: Optional[DomainTrustIndex] = None,
+        session=None,
+    ):
+        """
+        cache: verdict cache shared across jobs; defaults to a persistent
+        ``.verdict_cache.json`` next to the agent memory file.
+        trust_index: domain trust tiers for the heuristic path; defaults to
+        ``WEBNAV_TRUST_INDEX`` (a config file) or the built-in list.
+        session: optional requests.Session used for Gemini calls.
+        """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         self.api_url = api_url or os.getenv(
             "GEMINI_API_URL",
             "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent",
         )
+        self.http = session or requests
+        self.cache = cache if cache is not None else VerdictCache()
+        if trust_index is None:
+            index_path = os.getenv("WEBNAV_TRUST_INDEX")
+            trust_index = (
+                DomainTrustIndex.from_file(index_path)
+                if index_path
+                else DomainTrustIndex.default()
+            )
+        self.trust_index = trust_index
+        # Gemini requests sent so far (the cache warmer budgets by this)
+        self.api_calls = 0
+        self._calls_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
-    def verify_claims(self, results: List[NormalizedSearchResult]) -> Dict[str, Any]:
+    def verify_claims(
+        self,
+        results: List[NormalizedSearchResult],
+        timeout: float = 20,
+        page_excerpt: Optional[str] = None,
+        page_url: Optional[str] = None,
+        limiter=None,
+    ) -> Dict[str, Any]:
         """
+        timeout: seconds allowed for the Gemini request; on timeout the
+        uncached results fall back to the heuristic verdicts.
+        page_excerpt: extracted main text of the page the browser opened
+        (page_url), included in the prompt as extra evidence.
+        limiter: optional utils.limiter.AdaptiveLimiter bounding concurrent
+        Gemini calls; waiting for a slot counts against ``timeout``.
+
         Returns:
         {
             "verdicts": [{"url":..., "verdict": "...", "confidence": 0.82}, ...],
             "confidence": float,
             "summary": str
         }
+        plus "api_error" when the Gemini call failed and heuristics were used.
         """
         if not self.api_key:
             logger.warning("GEMINI_API_KEY not set. Using heuristic verifier.")
             return self._heuristic_verify(results)
 
-        # Build prompt
-        prompt = self._build_prompt(results)
+        candidates = results[:8]
+        cached: Dict[int, Dict[str, Any]] = {}
+        pending: List[NormalizedSearchResult] = []
+        for i, r in enumerate(candidates):
+            hit = self.cache.get(r)
+            if hit is not None:
+                cached[i] = dict(hit, url=r.url)
+            else:
+                pending.append(r)
 
+        summary = f"Served {len(cached)} verdicts from cache."
+        fresh: List[Dict[str, Any]] = []
+        api_error = None
+        if pending:
+            try:
+                prompt = self._build_prompt(pending, page_excerpt, page_url)
+                if limiter is None:
+                    text = self._call_gemini(prompt, timeout=timeout)
+                else:
+                    started = time.monotonic()
+                    with limiter.slot(timeout):
+                        remaining = max(timeout - (time.monotonic() - started), 0.1)
+                        text = self._call_gemini(prompt, timeout=remaining)
+                fresh, summary = self._parse_verdicts(text, pending)
+                for r, v in zip(pending, fresh):
+                    if v["verdict"] != "unknown":
+                        self.cache.put(r, {"verdict": v["verdict"], "confidence": v["confidence"]})
+                self.cache.save_if_due()
+            except Exception as e:
+                logger.warning(
+                    "Gemini API call failed, falling back to heuristic: %s", e
+                )
+                api_error = str(e)
+                if not cached:
+                    return dict(self._heuristic_verify(results), api_error=api_error)
+                fresh = self._heuristic_verify(pending)["verdicts"]
+
+        # Merge cached and fresh verdicts back into result order
+        fresh_iter = iter(fresh)
+        verdicts = [
+            cached[i] if i in cached else next(fresh_iter)
+            for i in range(len(candidates))
+        ]
+
+        overall_conf = (
+            sum(v["confidence"] for v in verdicts) / len(verdicts)
+            if verdicts
+            else 0.0
+        )
+
+        verification = {
+            "verdicts": verdicts,
+            "confidence": round(overall_conf, 2),
+            "summary": summary,
+            "cache_hits": len(cached),
+        }
+        if api_error:
+            verification["api_error"] = api_error
+        return verification
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def bulk_verify(self, urls: List[str]) -> BulkVerdicts:
+        """
+        Heuristic scoring for large offline URL sets (no Gemini calls, no
+        cap). Returns compact per-URL arrays instead of a dict per URL.
+        """
+        return self.trust_index.score_urls(urls)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _call_gemini(self, prompt: str, timeout: float = 20) -> str:
+        with self._calls_lock:
+            self.api_calls += 1
         headers = {
             "Content-Type": "application/json",
             "x-goog-api-key": self.api_key,  # REQUIRED for Gemini v1beta
@@ -61,52 +191,58 @@ class GeminiVerifier:
             },
         }
 
-        try:
-            resp = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=20,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-
-            # Safely extract Gemini text output
-            text = (
-                data.get("candidates", [{}])[0]
-                .get("content", {})
-                .get("parts", [{}])[0]
-                .get("text", "")
-            )
+        resp = self.http.post(
+            self.api_url,
+            headers=headers,
+            json=payload,
+            timeout=timeout,
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
-            if not text:
-                raise ValueError("Empty Gemini response")
+        # Safely extract Gemini text output
+        text = (
+            data.get("candidates", [{}])[0]
+            .get("content", {})
+            .get("parts", [{}])[0]
+            .get("text", "")
+        )
 
-            verdicts = [
-                {"url": r.url, "verdict": "unknown", "confidence": 0.5}
-                for r in results[:8]
-            ]
+        if not text:
+            raise ValueError("Empty Gemini response")
+        return text
 
-            return {
-                "verdicts": verdicts,
-                "confidence": 0.5,
-                "summary": text.strip(),
-            }
+    def _parse_verdicts(self, text: str, results: List[NormalizedSearchResult]):
+        """
+        Map the numbered verdict lines of a Gemini answer back onto
+        ``results``. Results the model did not rate stay ``"unknown"``.
+        """
+        by_index = {}
+        for m in _VERDICT_LINE.finditer(text):
+            conf = min(max(float(m.group(3)), 0.0), 1.0)
+            by_index[int(m.group(1))] = (m.group(2).lower(), conf)
 
-        except Exception as e:
-            logger.warning(
-                "Gemini API call failed, falling back to heuristic: %s", e
-            )
-            return self._heuristic_verify(results)
+        verdicts = []
+        for i, r in enumerate(results, 1):
+            verdict, conf = by_index.get(i, ("unknown", 0.5))
+            verdicts.append({"url": r.url, "verdict": verdict, "confidence": conf})
 
-    # ------------------------------------------------------------------
-    # Helpers
-    # ------------------------------------------------------------------
-    def _build_prompt(self, results: List[NormalizedSearchResult]) -> str:
+        m = _SUMMARY_LINE.search(text)
+        summary = m.group(1).strip() if m else text.strip()
+        return verdicts, summary
+
+    def _build_prompt(
+        self,
+        results: List[NormalizedSearchResult],
+        page_excerpt: Optional[str] = None,
+        page_url: Optional[str] = None,
+    ) -> str:
         lines = [
             "You are a fact-checking assistant.",
             "Evaluate the credibility and consensus of the following web search results.",
-            "Provide a short summary of whether the information appears reliable.\n",
+            "For every result, output one line: <number> | <verdict> | <confidence>,",
+            f"where verdict is one of {', '.join(VERDICT_LABELS)} and confidence is between 0 and 1.",
+            "Finish with a line 'SUMMARY: ...' briefly stating whether the information appears reliable.\n",
         ]
 
         for i, r in enumerate(results[:8], 1):
@@ -116,39 +252,18 @@ class GeminiVerifier:
                 f"   Snippet: {r.snippet}\n"
             )
 
+        if page_excerpt:
+            lines.append(
+                f"Main content of the opened page ({page_url or 'unknown URL'}), "
+                "use it to check the snippets:\n"
+                f"{page_excerpt}\n"
+            )
+
         return "\n".join(lines)
 
     def _heuristic_verify(self, results: List[NormalizedSearchResult]) -> Dict[str, Any]:
-        verdicts = []
-
-        for r in results[:8]:
-            u = r.url or ""
-
-            if any(
-                domain in u
-                for domain in (
-                    "wikipedia.org",
-                    ".gov",
-                    ".edu",
-                    "bbc.co",
-                    "nytimes.com",
-                )
-            ):
-                verdict = "likely-true"
-                conf = 0.85
-            else:
-                verdict = "uncertain"
-                conf = 0.45
-
-            verdicts.append(
-                {"url": u, "verdict": verdict, "confidence": conf}
-            )
-
-        overall_conf = (
-            sum(v["confidence"] for v in verdicts) / len(verdicts)
-            if verdicts
-            else 0.0
-        )
+        scored = self.trust_index.score_urls(r.url or "" for r in results[:8])
+        verdicts = list(scored.verdicts())
 
         summary = (
             f"Local heuristic: evaluated {len(verdicts)} results. "
@@ -157,6 +272,6 @@ class GeminiVerifier:
 
         return {
             "verdicts": verdicts,
-            "confidence": round(overall_conf, 2),
+            "confidence": round(scored.mean_confidence(), 2),
             "summary": summary,
         }
@@ -0,0 +1,156 @@
+# webnavigator_ai/verifier/trust_index.py
+import json
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Union
+
+TRUSTED = 1
+NEUTRAL = 0
+UNTRUSTED = -1
+
+TIER_NAMES = {"trusted": TRUSTED, "neutral": NEUTRAL, "untrusted": UNTRUSTED}
+
+# tier -> (verdict, confidence), shared by the per-job and bulk paths
+TIER_VERDICTS = {
+    TRUSTED: ("likely-true", 0.85),
+    NEUTRAL: ("uncertain", 0.45),
+    UNTRUSTED: ("likely-false", 0.2),
+}
+
+DEFAULT_TRUST_ENTRIES = {
+    "wikipedia.org": TRUSTED,
+    "gov": TRUSTED,
+    "gov.uk": TRUSTED,
+    "edu": TRUSTED,
+    "ac.uk": TRUSTED,
+    "bbc.co.uk": TRUSTED,
+    "bbc.com": TRUSTED,
+    "nytimes.com": TRUSTED,
+}
+
+
+def fast_host(url: str) -> str:
+    """
+    Extract the lower-cased host of ``url`` without ``urlsplit``; several
+    times cheaper on large batches and tolerant of scheme-less input.
+    """
+    start = url.find("://")
+    start = start + 3 if start != -1 else 0
+    end = len(url)
+    for sep in "/?#":
+        i = url.find(sep, start)
+        if i != -1 and i < end:
+            end = i
+    host = url[start:end]
+    at = host.rfind("@")
+    if at != -1:
+        host = host[at + 1:]
+    colon = host.find(":")
+    if colon != -1:
+        host = host[:colon]
+    return host.lower().rstrip(".")
+
+
+@dataclass(slots=True)
+class BulkVerdicts:
+    """Column-oriented verdicts: one entry per input URL, same order."""
+
+    urls: List[str]
+    tiers: array  # signed char, see TRUSTED / NEUTRAL / UNTRUSTED
+    confidence: array  # float
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def verdicts(self) -> Iterator[Dict]:
+        for url, tier, conf in zip(self.urls, self.tiers, self.confidence):
+            yield {"url": url, "verdict": TIER_VERDICTS[tier][0], "confidence": round(conf, 2)}
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            name: self.tiers.count(tier) for name, tier in TIER_NAMES.items()
+        }
+
+    def mean_confidence(self) -> float:
+        return sum(self.confidence) / len(self.confidence) if self.confidence else 0.0
+
+
+class DomainTrustIndex:
+    """
+    Precompiled domain-suffix -> trust tier index.
+
+    Lookups walk the host's label suffixes from most to least specific
+    (``en.wikipedia.org`` -> ``wikipedia.org`` -> ``org``), so each URL costs
+    a handful of dict probes regardless of how many entries are loaded.
+    """
+
+    def __init__(self, entries: Mapping[str, Union[int, str]]):
+        self._suffixes: Dict[str, int] = {}
+        for suffix, tier in entries.items():
+            if isinstance(tier, str):
+                tier = TIER_NAMES[tier.strip().lower()]
+            self._suffixes[suffix.strip().lower().lstrip(".")] = int(tier)
+
+    def __len__(self) -> int:
+        return len(self._suffixes)
+
+    @classmethod
+    def default(cls) -> "DomainTrustIndex":
+        return cls(DEFAULT_TRUST_ENTRIES)
+
+    @classmethod
+    def from_file(cls, path: str) -> "DomainTrustIndex":
+        """
+        Load a ``{"suffix": tier}`` JSON object, or a text file with one
+        ``<suffix> <tier>`` pair per line (``#`` starts a comment). Tiers are
+        ``trusted``/``neutral``/``untrusted`` or ``1``/``0``/``-1``.
+        """
+        p = Path(path)
+        text = p.read_text()
+        if p.suffix == ".json":
+            return cls(json.loads(text))
+
+        entries: Dict[str, Union[int, str]] = {}
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            suffix, tier = line.split()
+            entries[suffix] = int(tier) if tier.lstrip("-").isdigit() else tier
+        return cls(entries)
+
+    def tier_of_host(self, host: str) -> int:
+        suffixes = self._suffixes
+        while host:
+            tier = suffixes.get(host)
+            if tier is not None:
+                return tier
+            dot = host.find(".")
+            if dot == -1:
+                break
+            host = host[dot + 1:]
+        return NEUTRAL
+
+    def tier_of(self, url: str) -> int:
+        return self.tier_of_host(fast_host(url or ""))
+
+    def score_urls(self, urls: Iterable[str]) -> BulkVerdicts:
+        """
+        Score a batch of URLs. Hosts are resolved once per distinct host,
+        which is what makes crawled URL sets (many pages per site) cheap.
+        """
+        urls = list(urls)
+        host_tiers: Dict[str, int] = {}
+        tiers = array("b")
+        append = tiers.append
+        for url in urls:
+            host = fast_host(url or "")
+            tier = host_tiers.get(host)
+            if tier is None:
+                tier = host_tiers[host] = self.tier_of_host(host)
+            append(tier)
+
+        conf_of = {t: c for t, (_, c) in TIER_VERDICTS.items()}
+        confidence = array("f", [conf_of[t] for t in tiers])
+        return BulkVerdicts(urls=urls, tiers=tiers, confidence=confidence)